@@ -0,0 +1,43 @@
+from django.core.management.base import BaseCommand
+from django.conf import settings
+import time
+import numpy as np
+from accounts.services import reco
+from accounts.services.batch_reco import chunk_size_for, top_n_chunked
+
+
+# 야간 배치 점수 계산부의 처리량 측정 (DB 쓰기 제외, 무작위 유저 벡터 사용)
+class Command(BaseCommand):
+    help = "Benchmark batch top-N recommendation throughput (users/second)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=10000)
+        parser.add_argument("--items", type=int, default=None, help="Use random items instead of the current snapshot")
+        parser.add_argument("--dim", type=int, default=1536)
+        parser.add_argument("--top-n", type=int, default=None)
+        parser.add_argument("--max-bytes", type=int, default=None)
+
+    def handle(self, *args, **options):
+        rng = np.random.default_rng(0)
+        if options["items"]:
+            items = rng.standard_normal((options["items"], options["dim"]), dtype=np.float32)
+        else:
+            items = np.asarray(reco.SNAPSHOTS.current(force=True).vectors, dtype="float32")
+        if not len(items):
+            self.stderr.write("No item vectors (build a snapshot or pass --items).")
+            return
+
+        users = rng.standard_normal((options["users"], items.shape[1]), dtype=np.float32)
+        users /= np.linalg.norm(users, axis=1, keepdims=True)
+        top_n = options["top_n"] or settings.RECO_PRECOMPUTE_TOP_N
+        chunk = chunk_size_for(len(items), options["max_bytes"] or settings.RECO_PRECOMPUTE_MAX_BYTES)
+
+        started = time.monotonic()
+        for _ in top_n_chunked(users, items, top_n, chunk):
+            pass
+        elapsed = time.monotonic() - started
+
+        self.stdout.write(
+            f"{len(users)} users x {len(items)} items (dim {items.shape[1]}, top {top_n}, chunk {chunk}): "
+            f"{elapsed:.2f}s, {len(users) / elapsed:.0f} users/s"
+        )
@@ -0,0 +1,65 @@
+from django.core.management.base import BaseCommand
+from django.conf import settings
+import time
+import numpy as np
+from accounts.services import reco
+from accounts.services.embedding_store import EmbeddingStore, quantize
+
+
+# float32 기준 대비 float16 / int8 양자화의 메모리, 지연 시간, 순위 일치도 비교
+class Command(BaseCommand):
+    help = "Benchmark quantized embedding scoring against the float32 baseline"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--queries", type=int, default=100)
+        parser.add_argument("-k", type=int, default=10)
+        parser.add_argument("--rerank", type=int, default=None)
+        parser.add_argument("--items", type=int, default=None, help="Use random items instead of the current snapshot")
+        parser.add_argument("--dim", type=int, default=1536)
+
+    def handle(self, *args, **options):
+        rng = np.random.default_rng(0)
+        if options["items"]:
+            base = rng.standard_normal((options["items"], options["dim"]), dtype=np.float32)
+            base /= np.linalg.norm(base, axis=1, keepdims=True)
+        else:
+            base = np.asarray(reco.SNAPSHOTS.current(force=True).vectors, dtype="float32")
+        if not len(base):
+            self.stderr.write("No item vectors (build a snapshot or pass --items).")
+            return
+
+        k = options["k"]
+        rerank = options["rerank"] or settings.RECO_RERANK_CANDIDATES
+        ids = np.arange(len(base), dtype=np.int64)
+        rows = np.arange(len(base))
+        exact_store = EmbeddingStore(ids, base)
+        queries = base[rng.choice(len(base), min(options["queries"], len(base)), replace=False)]
+        exact_top = [np.argsort(-exact_store.dot(rows, u))[:k] for u in queries]
+
+        started = time.monotonic()
+        for u in queries:
+            exact_store.dot(rows, u)
+        baseline = (time.monotonic() - started) / len(queries)
+        self.stdout.write(
+            f"float32: {base.nbytes / 2**20:.1f} MiB, {baseline * 1000:.2f} ms/query"
+        )
+
+        for dtype in ("float16", "int8"):
+            vectors, scales = quantize(base, dtype)
+            store = EmbeddingStore(ids, vectors, scales=scales)
+            nbytes = vectors.nbytes + (scales.nbytes if scales is not None else 0)
+
+            overlap = 0
+            started = time.monotonic()
+            for u, expected in zip(queries, exact_top):
+                approx = store.dot(rows, u)
+                short = np.argpartition(-approx, min(rerank, len(rows) - 1))[:rerank]
+                top = short[np.argsort(-exact_store.dot(short, u))][:k]
+                overlap += len(np.intersect1d(top, expected))
+            elapsed = (time.monotonic() - started) / len(queries)
+
+            self.stdout.write(
+                f"{dtype}: {nbytes / 2**20:.1f} MiB ({nbytes / base.nbytes:.0%}), "
+                f"{elapsed * 1000:.2f} ms/query with re-rank of {rerank}, "
+                f"overlap@{k}={overlap / (len(queries) * min(k, len(base))):.3f}"
+            )
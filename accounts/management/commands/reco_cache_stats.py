@@ -0,0 +1,12 @@
+from django.core.management.base import BaseCommand
+from accounts.services.reco_cache import cache_stats
+
+
+class Command(BaseCommand):
+    help = "Show recommendation cache hit/miss counters"
+
+    def handle(self, *args, **options):
+        stats = cache_stats()
+        self.stdout.write(
+            f"hits={stats['hits']} misses={stats['misses']} hit_rate={stats['hit_rate']:.1%}"
+        )
@@ -0,0 +1,35 @@
+import sqlite3
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+
+# 로컬 / 테스트용 복제 흉내 : default SQLite 파일을 replica 파일로 온라인 백업
+# (운영에서는 DB 자체 복제 또는 Litestream 같은 도구가 이 역할을 함)
+class Command(BaseCommand):
+    help = "Copy the primary SQLite database into the read replica file (stand-in replication)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--interval", type=float, default=0, help="Repeat every N seconds (0 = once)")
+
+    def handle(self, *args, **options):
+        if "replica" not in settings.DATABASES:
+            raise CommandError("DATABASE_REPLICA_NAME is not set.")
+
+        while True:
+            started = time.monotonic()
+            self._copy(str(settings.DATABASES["default"]["NAME"]), str(settings.DATABASES["replica"]["NAME"]))
+            self.stdout.write(f"replica synced in {(time.monotonic() - started) * 1000:.0f} ms")
+            if not options["interval"]:
+                break
+            time.sleep(options["interval"])
+
+    def _copy(self, source, target):
+        src = sqlite3.connect(source, timeout=settings.SQLITE_BUSY_TIMEOUT)
+        dst = sqlite3.connect(target, timeout=settings.SQLITE_BUSY_TIMEOUT)
+        try:
+            src.backup(dst)
+        finally:
+            dst.close()
+            src.close()
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.4 on 2026-10-17 17:17
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0002_remove_userrecommendedkeyword_user_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UserTasteVector',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('vector', models.BinaryField()),
+                ('liked_ids', models.JSONField(default=list)),
+                ('snapshot_version', models.CharField(max_length=32)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='taste', to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+        migrations.DeleteModel(
+            name='RecommendedKeyword',
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.2.4 on 2026-10-17 17:19
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0003_usertastevector'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UserRecommendation',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('product_ids', models.BinaryField()),
+                ('snapshot_version', models.CharField(max_length=32)),
+                ('created_at', models.DateTimeField(auto_now=True)),
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='precomputed_recommendation', to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+    ]
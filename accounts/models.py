@@ -45,3 +45,28 @@ class User(AbstractBaseUser, PermissionsMixin):
     def __str__(self):
         return f"[{self.id}] {self.email} ({self.role})"
 
+
+# ( 2 ) 유저 취향 벡터 (찜 목록 기반, 추천 시 조회만)
+class UserTasteVector(models.Model):
+    user = models.OneToOneField(User, on_delete=models.CASCADE, related_name='taste')
+    # float32 벡터 바이트
+    vector = models.BinaryField()
+    # 최근 찜한 상품 id (최신 순) -> 상점 / 카테고리 보너스 계산용
+    liked_ids = models.JSONField(default=list)
+    # 벡터를 계산한 임베딩 스냅샷 버전
+    snapshot_version = models.CharField(max_length=32)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"[{self.id}] {self.user.email} ({self.snapshot_version})"
+
+# ( 3 ) 유저별 추천 후보 (야간 배치로 미리 계산, 추천 시 재채점)
+class UserRecommendation(models.Model):
+    user = models.OneToOneField(User, on_delete=models.CASCADE, related_name='precomputed_recommendation')
+    # 유사도 순 상품 id (int64 바이트)
+    product_ids = models.BinaryField()
+    snapshot_version = models.CharField(max_length=32)
+    created_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"[{self.id}] {self.user.email} ({self.snapshot_version})"
@@ -0,0 +1,106 @@
+import os
+
+import numpy as np
+
+# ------------------------------------------------
+# IVF 근사 최근접 이웃 인덱스 (코사인 / 내적 기준)
+#
+# 벡터를 spherical k-means 로 nlist 개의 리스트에 나누고,
+# 질의 시 질의 벡터와 가까운 중심 nprobe 개의 리스트만 정확히 계산한다.
+# 스냅샷 디렉토리에 아래 파일로 저장된다. (행 번호는 스냅샷 저장소 기준)
+#   ivf_centroids.npy  (nlist x dim)
+#   ivf_offsets.npy    (nlist + 1)   리스트 c 의 행 = rows[offsets[c]:offsets[c+1]]
+#   ivf_rows.npy       (N)
+
+INDEX_TYPE = "ivf"
+FILES = ("ivf_centroids", "ivf_offsets", "ivf_rows")
+
+
+def _normalize(x):
+    return x / (np.linalg.norm(x, axis=-1, keepdims=True) + 1e-8)
+
+
+def _kmeans(vectors, nlist, iters=10, sample=50_000, seed=0):
+    rng = np.random.default_rng(seed)
+    train = vectors
+    if len(train) > sample:
+        train = vectors[rng.choice(len(vectors), sample, replace=False)]
+    train = _normalize(np.asarray(train, dtype="float32"))
+
+    centroids = train[rng.choice(len(train), nlist, replace=False)]
+    for _ in range(iters):
+        assign = np.argmax(train @ centroids.T, axis=1)
+        for c in range(nlist):
+            members = train[assign == c]
+            # 빈 리스트는 임의의 벡터로 다시 시작
+            centroids[c] = members.sum(axis=0) if len(members) else train[rng.integers(len(train))]
+        centroids = _normalize(centroids)
+    return centroids
+
+
+class IVFIndex:
+    def __init__(self, centroids, offsets, rows):
+        self.centroids = centroids
+        self.offsets = offsets
+        self.rows = rows
+
+    @property
+    def nlist(self):
+        return self.centroids.shape[0]
+
+    @classmethod
+    def build(cls, vectors, nlist=None, batch=65_536):
+        n = len(vectors)
+        if nlist is None:
+            nlist = int(np.sqrt(n))
+        nlist = max(1, min(nlist, n))
+        centroids = _kmeans(vectors, nlist)
+
+        assign = np.empty(n, dtype=np.int32)
+        for start in range(0, n, batch):
+            chunk = np.asarray(vectors[start:start + batch], dtype="float32")
+            assign[start:start + batch] = np.argmax(chunk @ centroids.T, axis=1)
+
+        rows = np.argsort(assign, kind="stable").astype(np.int64)
+        offsets = np.zeros(nlist + 1, dtype=np.int64)
+        offsets[1:] = np.cumsum(np.bincount(assign, minlength=nlist))
+        return cls(centroids.astype("float32"), offsets, rows)
+
+    def save(self, directory):
+        np.save(os.path.join(directory, "ivf_centroids.npy"), self.centroids)
+        np.save(os.path.join(directory, "ivf_offsets.npy"), self.offsets)
+        np.save(os.path.join(directory, "ivf_rows.npy"), self.rows)
+        return list(FILES)
+
+    @classmethod
+    def load(cls, directory):
+        arrays = [np.load(os.path.join(directory, f"{name}.npy"), mmap_mode="r") for name in FILES]
+        return cls(*arrays)
+
+    # 상위 k 개 (행 번호, 유사도) 반환
+    # allowed : 저장소 행 기준 bool 마스크 (활성/재고 있는 상품만)
+    # 허용된 후보가 k 개 이상 모일 때까지 nprobe 보다 더 많은 리스트를 볼 수 있다
+    def search(self, vectors, u, k, allowed=None, nprobe=8):
+        order = np.argsort(-(self.centroids @ u))
+
+        picked, found = [], 0
+        for i, c in enumerate(order):
+            rows = self.rows[self.offsets[c]:self.offsets[c + 1]]
+            if allowed is not None:
+                rows = rows[allowed[rows]]
+            picked.append(rows)
+            found += len(rows)
+            if i + 1 >= nprobe and found >= k:
+                break
+
+        rows = np.concatenate(picked) if picked else np.array([], dtype=np.int64)
+        if not rows.size:
+            return rows, np.array([], dtype="float32")
+
+        rows = np.sort(rows)  # mmap 을 순차적으로 읽도록
+        sims = np.asarray(vectors[rows], dtype="float32") @ u
+        if len(rows) > k:
+            top = np.argpartition(-sims, k)[:k]
+            rows, sims = rows[top], sims[top]
+        order = np.argsort(-sims)
+        return rows[order], sims[order]
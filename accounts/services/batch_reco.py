@@ -0,0 +1,119 @@
+import time
+from datetime import timedelta
+
+import numpy as np
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from accounts.models import UserRecommendation, UserTasteVector
+
+from . import reco
+
+import logging
+logger = logging.getLogger(__name__)
+
+# ------------------------------------------------
+# 전체 소비자 추천 후보 일괄 계산 (야간 배치)
+#
+# 유저 x 차원 취향 행렬을 아이템 행렬과 청크 단위로 곱하고
+# argpartition 으로 유저별 상위 N 개만 남겨 UserRecommendation 에 저장한다.
+# 추천 요청은 이 후보만 읽어서 상점 / 카테고리 / 거리 보너스로 재채점한다.
+
+
+# 한 번에 DB 에서 읽고 쓰는 유저 수
+DB_BATCH = 2000
+
+
+# 한 번에 곱할 유저 수 (점수 행렬이 max_bytes 를 넘지 않도록)
+def chunk_size_for(n_items, max_bytes):
+    return max(1, int(max_bytes // (4 * max(n_items, 1))))
+
+
+# users (U x d), items (I x d) -> 청크마다 (시작 위치, 상위 N 아이템 인덱스 U' x N, 유사도 순)
+def top_n_chunked(users, items, top_n, chunk_size):
+    top_n = min(top_n, len(items))
+    for start in range(0, len(users), chunk_size):
+        scores = users[start:start + chunk_size] @ items.T
+        if top_n < scores.shape[1]:
+            top = np.argpartition(-scores, top_n - 1, axis=1)[:, :top_n]
+        else:
+            top = np.broadcast_to(np.arange(scores.shape[1]), scores.shape).copy()
+        top_scores = np.take_along_axis(scores, top, axis=1)
+        order = np.argsort(-top_scores, axis=1)
+        yield start, np.take_along_axis(top, order, axis=1)
+
+
+def precompute_recommendations(top_n=None, max_bytes=None, progress=None):
+    top_n = top_n or settings.RECO_PRECOMPUTE_TOP_N
+    max_bytes = max_bytes or settings.RECO_PRECOMPUTE_MAX_BYTES
+
+    store = reco.SNAPSHOTS.current(force=True)
+    version = reco.SNAPSHOTS.version
+    if version is None:
+        return {"users": 0, "seconds": 0.0, "users_per_second": 0.0}
+    features = reco.get_features(store)
+
+    # 추천 가능한 아이템만
+    item_rows = np.flatnonzero(features.available)
+    items = np.asarray(store.vectors[item_rows], dtype="float32")
+    item_ids = np.asarray(store.ids[item_rows], dtype=np.int64)
+
+    tastes = UserTasteVector.objects.filter(snapshot_version=version)
+    total = tastes.count()
+    chunk = chunk_size_for(len(items), max_bytes)
+    started = time.monotonic()
+    done = 0
+
+    qs = tastes.order_by("user_id").values_list("user_id", "vector").iterator(chunk_size=DB_BATCH)
+    while True:
+        batch = [row for _, row in zip(range(DB_BATCH), qs)]
+        if not batch:
+            break
+        user_ids = [user_id for user_id, _ in batch]
+        users = np.stack([np.frombuffer(bytes(v), dtype="float32") for _, v in batch])
+
+        results = []
+        if len(items):
+            for start, top in top_n_chunked(users, items, top_n, chunk):
+                for i, cols in enumerate(top):
+                    # 찜한 상품이 없는 유저(영벡터)는 저장하지 않음
+                    if not users[start + i].any():
+                        continue
+                    results.append(UserRecommendation(
+                        user_id=user_ids[start + i],
+                        product_ids=item_ids[cols].tobytes(),
+                        snapshot_version=version,
+                    ))
+
+        with transaction.atomic():
+            UserRecommendation.objects.filter(user_id__in=user_ids).delete()
+            UserRecommendation.objects.bulk_create(results)
+
+        done += len(batch)
+        elapsed = time.monotonic() - started
+        logger.info("precompute recommendations %d/%d (%.0f users/s)", done, total, done / max(elapsed, 1e-9))
+        if progress is not None:
+            progress(done, total)
+
+    elapsed = time.monotonic() - started
+    return {"users": done, "seconds": elapsed, "users_per_second": done / max(elapsed, 1e-9)}
+
+
+# 미리 계산된 후보 상품 id (없거나 오래되었으면 None -> 실시간 계산)
+def precomputed_ids(user):
+    since = timezone.now() - timedelta(seconds=settings.RECO_PRECOMPUTE_MAX_AGE)
+    data = (
+        UserRecommendation.objects
+        .filter(user=user, created_at__gte=since)
+        .values_list("product_ids", flat=True)
+        .first()
+    )
+    if data is None:
+        return None
+    return np.frombuffer(bytes(data), dtype=np.int64)
+
+
+# 찜 목록이 바뀌면 미리 계산된 후보는 버림
+def invalidate_precomputed(user):
+    UserRecommendation.objects.filter(user=user).delete()
@@ -0,0 +1,371 @@
+import json
+import os
+import shutil
+import struct
+import tempfile
+import threading
+import time
+
+import numpy as np
+
+from .ann import INDEX_TYPE, IVFIndex
+from .pca import PCAProjection
+
+# ------------------------------------------------
+# 상품 임베딩 저장소 (읽기 전용 mmap)
+#
+# 파일 구조
+#   [0, 64)            헤더 : magic / 포맷 버전 / 차원 / 개수 / 벡터 형식
+#   [64, 64 + 8*N)     상품 id (int64, 오름차순 정렬)
+#   [scale_offset, ..) 행별 스케일 (float32, N) - int8 형식일 때만
+#   [vec_offset, ...)  벡터 블록 (float32 | float16 | int8, N x dim, 64바이트 정렬)
+#
+# np.memmap 으로 열기 때문에 같은 호스트의 gunicorn / celery 워커가
+# 페이지 캐시의 사본 하나를 공유하고, 시작 시간이 카탈로그 크기와 무관해진다.
+# int8 은 행마다 max|v| / 127 스케일로 양자화한다. (v ≒ q * scale)
+
+MAGIC = b"JAEGOEMB"
+FORMAT_VERSION = 2
+HEADER_V1 = struct.Struct("<8sIIQ")
+HEADER = struct.Struct("<8sIIQI")
+HEADER_SIZE = 64
+ALIGN = 64
+
+DTYPES = ("float32", "float16", "int8")
+
+# dot() 한 번에 float32 로 바꿔 계산하는 행 수 (후보가 많아도 임시 버퍼 크기 고정)
+DOT_CHUNK_ROWS = 4096
+
+
+def _align(n):
+    return (n + ALIGN - 1) // ALIGN * ALIGN
+
+
+def _scale_offset(count):
+    return _align(HEADER_SIZE + 8 * count)
+
+
+def _vector_offset(count, dtype="float32"):
+    offset = _scale_offset(count)
+    if dtype == "int8":
+        offset = _align(offset + 4 * count)
+    return offset
+
+
+def quantize(vectors, dtype):
+    vectors = np.asarray(vectors, dtype="float32")
+    if dtype == "float32":
+        return vectors, None
+    if dtype == "float16":
+        return vectors.astype(np.float16), None
+    if dtype == "int8":
+        scales = np.abs(vectors).max(axis=1) / 127.0 if len(vectors) else np.empty(0, dtype="float32")
+        scales = np.where(scales > 0, scales, 1.0).astype("float32")
+        q = np.clip(np.rint(vectors / scales[:, None]), -127, 127).astype(np.int8)
+        return q, scales
+    raise ValueError(f"지원하지 않는 벡터 형식입니다: {dtype}")
+
+
+class EmbeddingStore:
+    def __init__(self, ids, vectors, path=None, model=None, index=None, scales=None):
+        self.ids = ids
+        self.vectors = vectors
+        self.path = path
+        # int8 형식의 행별 스케일 (그 외 None)
+        self.scales = scales
+        # 임베딩 모델 이름 (manifest 에 기록된 값)
+        self.model = model
+        # 근사 검색 인덱스 (스냅샷에 없으면 None)
+        self.index = index
+        # 1차 유사도 계산용 양자화 저장소 (없으면 None)
+        self.quantized = None
+        # PCA 적용 전 원본 벡터 저장소 (PCA 를 쓰지 않으면 None, 증분 빌드용)
+        self.raw = None
+
+    @property
+    def dim(self):
+        return self.vectors.shape[1]
+
+    @property
+    def dtype(self):
+        return self.vectors.dtype.name
+
+    def __len__(self):
+        return self.ids.shape[0]
+
+    def __contains__(self, pid):
+        return self.row(pid) is not None
+
+    @classmethod
+    def empty(cls, dim=0):
+        return cls(np.array([], dtype=np.int64), np.empty((0, dim), dtype="float32"))
+
+    @classmethod
+    def open(cls, path):
+        if not os.path.exists(path) or os.path.getsize(path) < HEADER_SIZE:
+            return cls.empty()
+
+        with open(path, "rb") as f:
+            raw = f.read(HEADER_SIZE)
+        magic, version, dim, count = HEADER_V1.unpack(raw[:HEADER_V1.size])
+        if magic != MAGIC or version not in (1, FORMAT_VERSION):
+            raise ValueError(f"지원하지 않는 임베딩 파일입니다: {path}")
+        dtype = "float32" if version == 1 else DTYPES[HEADER.unpack(raw[:HEADER.size])[4]]
+        if count == 0:
+            return cls.empty(dim)
+
+        ids = np.memmap(path, dtype=np.int64, mode="r", offset=HEADER_SIZE, shape=(count,))
+        scales = None
+        if dtype == "int8":
+            scales = np.memmap(path, dtype="float32", mode="r", offset=_scale_offset(count), shape=(count,))
+        vectors = np.memmap(
+            path, dtype=dtype, mode="r", offset=_vector_offset(count, dtype), shape=(count, dim)
+        )
+        return cls(ids, vectors, path=path, scales=scales)
+
+    # id -> 행 번호 (이진 탐색), 없으면 None
+    def row(self, pid):
+        i = int(np.searchsorted(self.ids, pid))
+        if i < len(self) and self.ids[i] == pid:
+            return i
+        return None
+
+    # 여러 id 를 한 번에 조회 -> (행 번호 배열, 존재 여부 마스크)
+    def lookup(self, pids):
+        pids = np.asarray(pids, dtype=np.int64)
+        if not len(self):
+            return np.zeros(pids.shape, dtype=np.int64), np.zeros(pids.shape, dtype=bool)
+        rows = np.searchsorted(self.ids, pids)
+        rows = np.minimum(rows, len(self) - 1)
+        found = self.ids[rows] == pids
+        return rows, found
+
+    def vector(self, pid):
+        i = self.row(pid)
+        return None if i is None else self.vectors[i]
+
+    # 지정한 행들과 u 의 내적 (양자화 형식이면 근사값)
+    def dot(self, rows, u):
+        rows = np.asarray(rows, dtype=np.int64)
+        u = np.asarray(u, dtype="float32")
+        sims = np.empty(len(rows), dtype="float32")
+        for start in range(0, len(rows), DOT_CHUNK_ROWS):
+            chunk = rows[start:start + DOT_CHUNK_ROWS]
+            sims[start:start + len(chunk)] = np.asarray(self.vectors[chunk], dtype="float32") @ u
+        if self.scales is not None:
+            sims *= self.scales[rows]
+        return sims
+
+
+# ------------------------------------------------
+# 저장 (임시 파일에 쓰고 rename -> 열려 있는 mmap 은 이전 inode 를 계속 사용)
+def write_embedding_store(path, ids, vectors, dtype="float32"):
+    ids = np.asarray(ids, dtype=np.int64)
+    vectors = np.asarray(vectors, dtype="float32")
+    if vectors.ndim != 2 or vectors.shape[0] != ids.shape[0]:
+        raise ValueError("ids 와 vectors 의 개수가 일치하지 않습니다.")
+
+    order = np.argsort(ids, kind="stable")
+    ids = ids[order]
+    vectors, scales = quantize(vectors[order], dtype)
+    count, dim = vectors.shape
+
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        header = HEADER.pack(MAGIC, FORMAT_VERSION, dim, count, DTYPES.index(dtype))
+        f.write(header.ljust(HEADER_SIZE, b"\0"))
+        f.write(ids.tobytes())
+        if scales is not None:
+            f.write(b"\0" * (_scale_offset(count) - f.tell()))
+            f.write(scales.tobytes())
+        f.write(b"\0" * (_vector_offset(count, dtype) - f.tell()))
+        f.write(np.ascontiguousarray(vectors).tobytes())
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+# ------------------------------------------------
+# 버전별 스냅샷 + manifest 포인터
+#
+#   EMBEDDINGS_DIR/
+#     manifest.json                 {"version", "path", "model", "dim", ...}
+#     snapshots/<version>/product_embeddings.bin
+#
+# 스냅샷은 임시 디렉토리에 다 쓴 뒤 rename 하고, 마지막에 manifest 를
+# os.replace 로 교체한다. 웹 워커는 manifest 의 mtime 만 확인하다가
+# 바뀌었을 때 새 스냅샷을 mmap 으로 다시 연다. (재시작 불필요)
+
+MANIFEST_NAME = "manifest.json"
+SNAPSHOTS_DIR = "snapshots"
+STORE_FILE = "product_embeddings.bin"
+QUANTIZED_FILE = "product_embeddings.{dtype}.bin"
+RAW_FILE = "product_embeddings.raw.bin"
+KEEP_SNAPSHOTS = 3
+
+
+def _new_version():
+    return time.strftime("%Y%m%d%H%M%S") + f"{time.time_ns() % 1_000_000_000:09d}"
+
+
+def read_manifest(base_dir):
+    path = os.path.join(base_dir, MANIFEST_NAME)
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return None
+
+
+def _write_manifest(base_dir, manifest):
+    path = os.path.join(base_dir, MANIFEST_NAME)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+# meta : ids 와 같은 순서의 보조 배열 (예: 텍스트 해시, 임베딩 시각) -> <name>.npy
+# model : 임베딩 모델 이름 (차원과 함께 manifest 에 기록)
+# build_index : 같은 스냅샷에 IVF 근사 검색 인덱스도 함께 저장
+# quantize : "float16" | "int8" 이면 1차 유사도 계산용 양자화 사본도 함께 저장
+# pca_components : 지정하면 PCA 로 차원을 줄인 벡터를 저장 (원본은 증분 빌드용으로 따로 보관)
+def publish_snapshot(
+    base_dir, ids, vectors, meta=None, model=None,
+    build_index=False, quantize=None, pca_components=None,
+):
+    snapshots = os.path.join(base_dir, SNAPSHOTS_DIR)
+    os.makedirs(snapshots, exist_ok=True)
+
+    ids = np.asarray(ids, dtype=np.int64)
+    vectors = np.asarray(vectors, dtype="float32")
+    order = np.argsort(ids, kind="stable")
+    meta = {name: np.asarray(values)[order] for name, values in (meta or {}).items()}
+
+    version = _new_version()
+    tmp_dir = tempfile.mkdtemp(prefix=f".{version}-", dir=snapshots)
+    try:
+        pca = None
+        if pca_components and len(ids):
+            write_embedding_store(os.path.join(tmp_dir, RAW_FILE), ids[order], vectors[order])
+            projection = PCAProjection.fit(vectors, pca_components)
+            projection.save(tmp_dir)
+            vectors = projection.transform(vectors)
+            pca = projection.describe()
+        write_embedding_store(os.path.join(tmp_dir, STORE_FILE), ids[order], vectors[order])
+        if quantize:
+            write_embedding_store(
+                os.path.join(tmp_dir, QUANTIZED_FILE.format(dtype=quantize)),
+                ids[order], vectors[order], dtype=quantize,
+            )
+        for name, values in meta.items():
+            np.save(os.path.join(tmp_dir, f"{name}.npy"), values)
+        index = None
+        if build_index and len(ids):
+            ivf = IVFIndex.build(vectors[order])
+            ivf.save(tmp_dir)
+            index = {"type": INDEX_TYPE, "nlist": ivf.nlist}
+        os.rename(tmp_dir, os.path.join(snapshots, version))
+    except Exception:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        raise
+
+    _write_manifest(base_dir, {
+        "version": version,
+        "path": os.path.join(SNAPSHOTS_DIR, version),
+        "count": int(len(ids)),
+        "model": model,
+        "dim": int(vectors.shape[1]),
+        "meta": sorted(meta),
+        "index": index,
+        "quantized": quantize or None,
+        "pca": pca,
+    })
+    _prune_snapshots(snapshots, keep=KEEP_SNAPSHOTS)
+    return version
+
+
+# 현재 스냅샷을 (manifest, store, meta) 로 연다. 없으면 빈 저장소
+def open_snapshot(base_dir):
+    manifest = read_manifest(base_dir)
+    if manifest is None:
+        return None, EmbeddingStore.empty(), {}
+
+    snapshot_dir = os.path.join(base_dir, manifest["path"])
+    store = _open_store(snapshot_dir, manifest)
+    meta = {
+        name: np.load(os.path.join(snapshot_dir, f"{name}.npy"))
+        for name in manifest.get("meta", [])
+    }
+    return manifest, store, meta
+
+
+def _open_store(snapshot_dir, manifest):
+    store = EmbeddingStore.open(os.path.join(snapshot_dir, STORE_FILE))
+    store.model = manifest.get("model")
+    if (manifest.get("index") or {}).get("type") == INDEX_TYPE and len(store):
+        store.index = IVFIndex.load(snapshot_dir)
+    if manifest.get("pca") and len(store):
+        store.raw = EmbeddingStore.open(os.path.join(snapshot_dir, RAW_FILE))
+    if manifest.get("quantized") and len(store):
+        store.quantized = EmbeddingStore.open(
+            os.path.join(snapshot_dir, QUANTIZED_FILE.format(dtype=manifest["quantized"]))
+        )
+    return store
+
+
+# 오래된 스냅샷 정리 (이미 mmap 으로 열린 파일은 unlink 되어도 계속 읽을 수 있음)
+def _prune_snapshots(snapshots, keep):
+    versions = sorted(
+        name for name in os.listdir(snapshots)
+        if not name.startswith(".") and os.path.isdir(os.path.join(snapshots, name))
+    )
+    for name in versions[:-keep]:
+        shutil.rmtree(os.path.join(snapshots, name), ignore_errors=True)
+
+
+class SnapshotReader:
+    def __init__(self, base_dir, check_interval=5.0):
+        self.base_dir = base_dir
+        self.check_interval = check_interval
+        self._lock = threading.Lock()
+        self._store = EmbeddingStore.empty()
+        self._version = None
+        self._mtime_ns = None
+        self._checked_at = 0.0
+
+    @property
+    def version(self):
+        return self._version
+
+    # 현재 스냅샷 반환 (check_interval 마다, force 면 즉시 manifest mtime 확인)
+    def current(self, force=False):
+        now = time.monotonic()
+        if force or now - self._checked_at >= self.check_interval:
+            self._checked_at = now
+            self._refresh()
+        return self._store
+
+    def _refresh(self):
+        try:
+            mtime_ns = os.stat(os.path.join(self.base_dir, MANIFEST_NAME)).st_mtime_ns
+        except FileNotFoundError:
+            return
+        if mtime_ns == self._mtime_ns:
+            return
+
+        with self._lock:
+            if mtime_ns == self._mtime_ns:
+                return
+            manifest = read_manifest(self.base_dir)
+            if manifest is None or manifest.get("version") == self._version:
+                self._mtime_ns = mtime_ns
+                return
+            snapshot_dir = os.path.join(self.base_dir, manifest["path"])
+            if not os.path.exists(os.path.join(snapshot_dir, STORE_FILE)):
+                return
+            store = _open_store(snapshot_dir, manifest)
+            # 참조 교체는 원자적 -> 진행 중인 요청은 이전 스냅샷을 그대로 사용
+            self._store, self._version, self._mtime_ns = store, manifest["version"], mtime_ns
@@ -0,0 +1,55 @@
+import numpy as np
+
+from products.models import Product
+
+# ------------------------------------------------
+# 추천 후보 특성 테이블 (임베딩 저장소 행과 같은 순서의 컬럼 배열)
+#
+# store_id / category_id / lat / lng / is_active / stock 을 NumPy 배열로 들고 있어서
+# 필터, 거리, 보너스 계산이 모두 배열 연산으로 끝난다.
+# 처음 한 번 전체를 읽고, 이후에는 Product / Store 의 updated_at 기준으로 바뀐 행만 반영한다.
+# (워커별 동기화는 project.worker_index)
+
+FIELDS = ("id", "store_id", "category_id", "store__latitude", "store__longitude", "is_active", "stock")
+
+
+class CandidateFeatures:
+    def __init__(self, store):
+        self.store = store
+        n = len(store)
+        self.store_id = np.full(n, -1, dtype=np.int64)
+        self.category_id = np.full(n, -1, dtype=np.int64)
+        self.lat = np.full(n, np.nan, dtype=np.float64)
+        self.lng = np.full(n, np.nan, dtype=np.float64)
+        self.is_active = np.zeros(n, dtype=bool)
+        self.stock = np.zeros(n, dtype=np.int64)
+
+    @classmethod
+    def build(cls, store):
+        features = cls(store)
+        features._apply(Product.objects.values_list(*FIELDS))
+        return features
+
+    # since 이후 바뀐 상품 / 가게만 다시 읽음
+    def refresh(self, since):
+        self._apply(Product.objects.changed_since(since).values_list(*FIELDS))
+
+    def _apply(self, values):
+        values = list(values)
+        if not values or not len(self.store):
+            return
+        ids, store_ids, category_ids, lats, lngs, actives, stocks = zip(*values)
+        rows, found = self.store.lookup(ids)
+        rows = rows[found]
+
+        self.store_id[rows] = np.array(store_ids, dtype=np.int64)[found]
+        self.category_id[rows] = np.array(category_ids, dtype=np.int64)[found]
+        self.lat[rows] = np.array(lats, dtype=np.float64)[found]
+        self.lng[rows] = np.array(lngs, dtype=np.float64)[found]
+        self.is_active[rows] = np.array(actives, dtype=bool)[found]
+        self.stock[rows] = np.array(stocks, dtype=np.int64)[found]
+
+    # 추천 가능한 행 (활성 + 재고 있음)
+    @property
+    def available(self):
+        return self.is_active & (self.stock > 0)
@@ -0,0 +1,60 @@
+import os
+
+import numpy as np
+
+# ------------------------------------------------
+# 임베딩 차원 축소 (PCA, 예: 1536 -> 256)
+#
+# 스냅샷을 만들 때 학습해서 같은 디렉토리에 저장한다.
+#   pca_components.npy  (k x dim)
+# 주성분 축으로의 투영만 하고 평균은 빼지 않는다. (평균을 빼면 상품마다 다른 항이 생겨
+# 내적 순위가 바뀜, 주성분을 전부 쓰면 단순 회전이라 순위가 그대로 유지된다)
+# 축소한 벡터는 다시 L2 정규화해서 내적이 코사인 유사도 역할을 하도록 유지한다.
+
+
+def _normalize(x):
+    return (x / (np.linalg.norm(x, axis=-1, keepdims=True) + 1e-8)).astype("float32")
+
+
+class PCAProjection:
+    def __init__(self, components, explained_variance=None):
+        self.components = components
+        self.explained_variance = explained_variance
+
+    @property
+    def n_components(self):
+        return self.components.shape[0]
+
+    @classmethod
+    def fit(cls, vectors, n_components, sample=50_000, seed=0):
+        # scikit-learn 은 스냅샷 빌드 시에만 필요
+        from sklearn.decomposition import PCA
+
+        vectors = np.asarray(vectors, dtype="float32")
+        train = vectors
+        if len(train) > sample:
+            train = vectors[np.random.default_rng(seed).choice(len(vectors), sample, replace=False)]
+        n_components = min(n_components, *train.shape)
+        pca = PCA(n_components=n_components, random_state=seed).fit(train)
+        return cls(
+            pca.components_.astype("float32"),
+            float(pca.explained_variance_ratio_.sum()),
+        )
+
+    def transform(self, vectors):
+        vectors = np.asarray(vectors, dtype="float32")
+        return _normalize(vectors @ self.components.T)
+
+    def describe(self):
+        return {
+            "components": int(self.n_components),
+            "input_dim": int(self.components.shape[1]),
+            "explained_variance": self.explained_variance,
+        }
+
+    def save(self, directory):
+        np.save(os.path.join(directory, "pca_components.npy"), self.components)
+
+    @classmethod
+    def load(cls, directory):
+        return cls(np.load(os.path.join(directory, "pca_components.npy")))
@@ -1,42 +1,62 @@
 import numpy as np
 from products.models import Product
 from django.conf import settings
+from project.worker_index import WorkerIndex
+
+from .embedding_store import SnapshotReader
+from .features import CandidateFeatures
+# taste / batch_reco 도 이 모듈을 import 하므로 모듈 단위로 (어느 쪽을 먼저 import 해도 되도록)
+from . import batch_reco, taste
 
 EMB_DIR = settings.EMBEDDINGS_DIR
 
-def load_item_vectors():
-    path = EMB_DIR / "product_vectors.npy"
-    if path.exists() and path.stat().st_size > 0:
-        return np.load(path)
-    return np.empty((0, 1536), dtype="float32")
+# 워커마다 하나, manifest 가 바뀌면 새 스냅샷으로 교체
+SNAPSHOTS = SnapshotReader(EMB_DIR)
 
-def load_item_ids():
-    path = EMB_DIR / "product_ids.npy"
-    if path.exists() and path.stat().st_size > 0:
-        return np.load(path)
-    return np.array([], dtype=np.int64)
+def get_store():
+    return SNAPSHOTS.current()
 
-ITEM_VECS = load_item_vectors()
-ITEM_IDS = load_item_ids()
-IDX = {int(pid): i for i, pid in enumerate(ITEM_IDS)}
+# ------------------------------------------------
+# 후보 특성 테이블 (스냅샷이 바뀌면 새로 만들고, 그 외에는 바뀐 행만 반영)
+_FEATURES = WorkerIndex(
+    build=CandidateFeatures.build,
+    update=CandidateFeatures.refresh,
+    refresh_setting="RECO_FEATURES_REFRESH_SECONDS",
+    outdated=lambda features, store: features.store is not store,
+)
+
+def get_features(store):
+    return _FEATURES.get(store)
+
+# 찜한 상품 id (최신 순) -> 추천 가능한 저장소 행
+def liked_rows_for_user(user, store, features):
+    liked_ids = list(
+        Product.objects.filter(wishlisted_by__consumer=user)
+        .order_by('-id')
+        .values_list("id", flat=True)
+    )
+    rows, found = store.lookup(liked_ids)
+    rows = rows[found]
+    return rows[features.available[rows]]
 
 # ------------------------------------------------
 # 유저 벡터 계산
-def user_vector_from_likes(user, max_recent=3):
-    liked_qs = Product.objects.filter(
-        wishlisted_by__consumer=user, is_active=True, stock__gt=0
-    ).order_by('-id')
-    liked = [pid for pid in liked_qs.values_list("id", flat=True) if pid in IDX]
-
-    if not liked:
-        return np.zeros(ITEM_VECS.shape[1] if ITEM_VECS.size else 1536, dtype="float32")
-
-    liked = liked[:max_recent]
-    vecs = np.stack([ITEM_VECS[IDX[pid]] for pid in liked])
-    weights = np.linspace(1.0, 0.5, len(liked))[:, None]
+def user_vector_from_rows(store, rows, max_recent=3):
+    if not rows.size:
+        return np.zeros(store.dim, dtype="float32")
+
+    rows = rows[:max_recent]
+    vecs = store.vectors[rows]
+    weights = np.linspace(1.0, 0.5, len(rows))[:, None]
     u = (vecs * weights).sum(axis=0) / weights.sum()
     return (u / (np.linalg.norm(u) + 1e-8)).astype("float32")
 
+def user_vector_from_likes(user, max_recent=3, store=None):
+    if store is None:
+        store = get_store()
+    rows = liked_rows_for_user(user, store, get_features(store))
+    return user_vector_from_rows(store, rows, max_recent=max_recent)
+
 # ------------------------
 # 거리 계산 (haversine)
 def haversine(lat1, lng1, lat2, lng2):
@@ -48,6 +68,26 @@ def haversine(lat1, lng1, lat2, lng2):
     c = 2 * np.arctan2(np.sqrt(a), np.sqrt(1 - a))
     return R * c
 
+# 반경 안의 후보 행만
+def within_distance(features, rows, lat, lng, max_distance_km):
+    return rows[haversine(lat, lng, features.lat[rows], features.lng[rows]) <= max_distance_km]
+
+# ------------------------------------------------
+# 후보 검색 (exact : 활성 후보 전체 / ann : IVF 로 유사도 상위 후보만)
+# rows : 활성 / 재고 있는 (위치가 있으면 반경 안의) 후보의 저장소 행 번호 -> ann 에서는 허용 마스크
+def search_candidates(store, u, rows, method=None):
+    method = method or settings.RECO_SEARCH
+    if method == "ann" and store.index is not None:
+        allowed = np.zeros(len(store), dtype=bool)
+        allowed[rows] = True
+        rows, _ = store.index.search(
+            store.vectors, u,
+            k=settings.RECO_ANN_CANDIDATES,
+            allowed=allowed,
+            nprobe=settings.RECO_ANN_NPROBE,
+        )
+    return rows
+
 # ------------------------------------------------
 # 추천 계산
 def recommend_for_user(
@@ -62,67 +102,70 @@ def recommend_for_user(
     distance_weight=0.3
     ):
     
-    u = user_vector_from_likes(user)
+    # 한 요청 안에서는 같은 스냅샷 사용
+    store = get_store()
+    features = get_features(store)
+
+    # 저장된 취향 벡터 조회 (찜 목록 재계산 없음)
+    u, liked_rows = taste.get_user_taste(user, store, features)
     if not np.any(u):
         return Product.objects.none()
 
-    liked_qs = Product.objects.filter(
-        wishlisted_by__consumer=user, is_active=True, stock__gt=0
-    ).order_by('-id')
-    liked_ids = list(liked_qs.values_list("id", flat=True))
-    liked_cats = list(liked_qs.values_list("category_id", flat=True))
-    liked_stores = list(liked_qs.values_list("store_id", flat=True))
-
-    candidates = Product.objects.filter(is_active=True, stock__gt=0)
-    candidate_ids = [pid for pid in candidates.values_list("id", flat=True) if pid in IDX]
-    if not candidate_ids:
+    has_location = user_lat is not None and user_lng is not None
+
+    # 야간 배치로 미리 계산된 후보가 있으면 그 안에서만 재채점
+    # 후보는 위치와 관계없는 유사도 상위 N 개라서 반경 안에 limit 개보다 적게 남으면 실시간 검색으로
+    rows = None
+    ids = batch_reco.precomputed_ids(user)
+    if ids is not None:
+        rows, found = store.lookup(ids)
+        rows = rows[found]
+        rows = rows[features.available[rows]]
+        if has_location:
+            rows = within_distance(features, rows, user_lat, user_lng, max_distance_km)
+        if len(rows) < limit:
+            rows = None
+    if rows is None:
+        # 반경 조건도 검색 전에 후보에 넣음 (ann 상위 후보를 먼저 뽑고 거르면 근처 상품이 안 남을 수 있음)
+        rows = np.flatnonzero(features.available)
+        if has_location:
+            rows = within_distance(features, rows, user_lat, user_lng, max_distance_km)
+        rows = search_candidates(store, u, rows)
+    if not rows.size:
         return Product.objects.none()
 
-    candidate_vecs = ITEM_VECS[[IDX[pid] for pid in candidate_ids]]
-    candidates_map = candidates.in_bulk(candidate_ids)
-
-    # 거리 계산 및 필터 + 거리 점수
-    dist_score = np.zeros(len(candidate_ids), dtype=np.float32)
-    if user_lat is not None and user_lng is not None:
-        distances = np.array([
-            haversine(user_lat, user_lng, float(candidates_map[pid].store.latitude), float(candidates_map[pid].store.longitude))
-            for pid in candidate_ids
-        ])
-        valid_distance_idx = np.where(distances <= max_distance_km)[0]
-        if valid_distance_idx.size == 0:
-            return Product.objects.none()
-        candidate_ids = [candidate_ids[i] for i in valid_distance_idx]
-        candidate_vecs = candidate_vecs[valid_distance_idx]
-        distances = distances[valid_distance_idx]
-        dist_score = 1 / (1 + distances)
-
-    sims = candidate_vecs @ u
-    
+    # 거리 점수
+    dist_score = np.zeros(len(rows), dtype=np.float32)
+    if has_location:
+        dist_score = 1 / (1 + haversine(user_lat, user_lng, features.lat[rows], features.lng[rows]))
+
     # 보너스 점수 ( 상점, 카테고리, 거리 )
-    bonus = np.zeros_like(sims)
-
-    for i, pid in enumerate(candidate_ids):
-        p = candidates_map[pid]
-        if p.store_id in liked_stores:
-            bonus[i] += store_weight
-        if p.category_id in liked_cats:
-            bonus[i] += category_weight
-    bonus += distance_weight * dist_score
-
-    # 최종 점수
-    score = sims + bonus
-    
-    
+    bonus = (
+        store_weight * np.isin(features.store_id[rows], features.store_id[liked_rows])
+        + category_weight * np.isin(features.category_id[rows], features.category_id[liked_rows])
+        + distance_weight * dist_score
+    )
+
+    # 양자화 사본이 있으면 근사 유사도로 상위 후보만 남긴 뒤 float32 로 재채점
+    rerank = settings.RECO_RERANK_CANDIDATES
+    if store.quantized is not None and len(rows) > rerank:
+        approx = store.quantized.dot(rows, u) + bonus
+        top = np.argpartition(-approx, rerank)[:rerank]
+        rows, bonus = rows[top], bonus[top]
+
+    # 최종 점수는 상점 / 카테고리 / 거리 보너스를 포함해 정확히 계산
+    score = store.dot(rows, u) + bonus
+
     valid_idx = np.where(score >= sim_threshold)[0]
     if valid_idx.size == 0:
         return Product.objects.none()
 
-    final_ids = [candidate_ids[i] for i in valid_idx]
+    final_ids = [int(pid) for pid in store.ids[rows[valid_idx]]]
     final_scores = score[valid_idx]
 
     top_idx = np.argsort(-final_scores)[:limit]
     top_ids = [final_ids[i] for i in top_idx]
 
-    qs = Product.objects.filter(id__in=top_ids)
+    qs = Product.objects.select_related("store", "category").filter(id__in=top_ids)
     id2rank = {pid: r for r, pid in enumerate(top_ids)}
     return sorted(qs, key=lambda p: id2rank[p.id])
@@ -0,0 +1,81 @@
+from django.conf import settings
+from django.core.cache import cache
+
+from products.models import Product
+from project.cache_counters import incr
+
+from . import reco
+
+# ------------------------------------------------
+# 유저별 추천 결과 캐시
+#
+# 키 : 유저 id + 세대 번호 + 임베딩 스냅샷 버전 + 대략적인 위치 칸
+#   - 찜 추가/삭제 시 세대 번호를 올려 해당 유저의 캐시를 한 번에 무효화
+#   - 스냅샷이 바뀌면 버전이 달라지므로 자연스럽게 새로 계산
+# 캐시에는 순위가 매겨진 상품 id 만 저장하고, 꺼낼 때 현재 활성/재고 상태로 다시 거른다.
+
+HIT_KEY = "reco:stats:hit"
+MISS_KEY = "reco:stats:miss"
+
+
+# 위치를 RECO_CACHE_CELL_DEGREES 크기의 격자 칸으로 (기본 0.01도 ≒ 1km)
+def location_cell(lat, lng):
+    if lat is None or lng is None:
+        return "-"
+    size = settings.RECO_CACHE_CELL_DEGREES
+    return f"{int(lat // size)}:{int(lng // size)}"
+
+
+def _generation(user_id):
+    return cache.get_or_set(f"reco:gen:{user_id}", 0, timeout=None)
+
+
+def cache_key(user_id, version, cell):
+    return f"reco:{user_id}:{_generation(user_id)}:{version}:{cell}"
+
+
+def invalidate_user(user):
+    invalidate_user_ids([user.id])
+
+
+def invalidate_user_ids(user_ids):
+    for user_id in user_ids:
+        incr(f"reco:gen:{user_id}")
+
+
+def cache_stats():
+    hits = cache.get(HIT_KEY, 0)
+    misses = cache.get(MISS_KEY, 0)
+    total = hits + misses
+    return {"hits": hits, "misses": misses, "hit_rate": hits / total if total else 0.0}
+
+
+def cached_recommend_for_user(user, limit=10, user_lat=None, user_lng=None, max_distance_km=5.0):
+    reco.get_store()  # manifest 확인 -> 최신 스냅샷 버전
+    key = cache_key(user.id, reco.SNAPSHOTS.version, location_cell(user_lat, user_lng))
+
+    ranked_ids = cache.get(key)
+    if ranked_ids is None:
+        incr(MISS_KEY)
+        # 품절로 빠지는 상품이 있어도 limit 개를 채울 수 있도록 넉넉히 저장
+        products = reco.recommend_for_user(
+            user,
+            limit=limit * settings.RECO_CACHE_DEPTH,
+            user_lat=user_lat,
+            user_lng=user_lng,
+            max_distance_km=max_distance_km,
+        )
+        cache.set(key, [p.id for p in products], timeout=settings.RECO_CACHE_TTL)
+        return list(products)[:limit]
+
+    incr(HIT_KEY)
+    if not ranked_ids:
+        return []
+
+    # 캐시된 id 중 현재 추천 가능한 상품만 (품절 / 비활성 상품 노출 방지)
+    available = (
+        Product.objects.select_related("store", "category")
+        .filter(id__in=ranked_ids, is_active=True, stock__gt=0)
+        .in_bulk()
+    )
+    return [available[pid] for pid in ranked_ids if pid in available][:limit]
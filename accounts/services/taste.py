@@ -0,0 +1,132 @@
+from itertools import chain
+
+import numpy as np
+from django.db import transaction
+from django.utils import timezone
+
+from products.models import Wishlist
+from accounts.models import UserTasteVector
+
+from . import reco
+from . import reco_cache
+
+# ------------------------------------------------
+# 유저 취향 벡터 저장 / 조회
+#
+# 찜 추가/삭제 시 바로 다시 계산해서 저장하고, 추천 요청은 저장된 벡터 하나만 읽는다.
+# 저장된 벡터의 스냅샷 버전이 현재와 다르면 그 자리에서 다시 계산한다.
+# (전체 재계산은 임베딩 스냅샷이 바뀐 뒤 rebuild_user_tastes 작업이 담당)
+
+MAX_LIKED = 50
+
+
+def _to_bytes(u):
+    return np.asarray(u, dtype="float32").tobytes()
+
+
+def _from_bytes(data):
+    return np.frombuffer(bytes(data), dtype="float32")
+
+
+def _compute(liked_ids, store, features):
+    rows, found = store.lookup(liked_ids)
+    rows = rows[found]
+    rows = rows[features.available[rows]]
+    return reco.user_vector_from_rows(store, rows)
+
+
+def _liked_ids(user):
+    return list(
+        Wishlist.objects.filter(consumer=user)
+        .order_by('-product_id')
+        .values_list("product_id", flat=True)[:MAX_LIKED]
+    )
+
+
+# 찜 목록이 바뀌었을 때 호출
+def update_user_taste(user, store=None, features=None):
+    store = store if store is not None else reco.get_store()
+    version = reco.SNAPSHOTS.version
+    if version is None:
+        return None
+    features = features if features is not None else reco.get_features(store)
+
+    liked_ids = _liked_ids(user)
+    u = _compute(liked_ids, store, features)
+    taste, _ = UserTasteVector.objects.update_or_create(
+        user=user,
+        defaults={"vector": _to_bytes(u), "liked_ids": liked_ids, "snapshot_version": version},
+    )
+    return taste
+
+
+# 추천용 (유저 벡터, 찜한 상품 중 추천 가능한 저장소 행)
+def get_user_taste(user, store, features):
+    taste = UserTasteVector.objects.filter(user=user).first()
+    if taste is None or taste.snapshot_version != reco.SNAPSHOTS.version:
+        taste = update_user_taste(user, store, features)
+        if taste is None:
+            return np.zeros(store.dim, dtype="float32"), np.array([], dtype=np.int64)
+
+    rows, found = store.lookup(taste.liked_ids)
+    rows = rows[found]
+    return _from_bytes(taste.vector), rows[features.available[rows]]
+
+
+# 전체 재계산 (스냅샷 변경 후) -> 처리한 유저 수
+def rebuild_all_tastes(batch_size=500):
+    store = reco.SNAPSHOTS.current(force=True)
+    version = reco.SNAPSHOTS.version
+    if version is None:
+        return 0
+    features = reco.get_features(store)
+    started = timezone.now()
+
+    # 찜 목록을 유저 순서대로 한 번에 읽어서 묶음 단위로 저장
+    wishlist = (
+        Wishlist.objects
+        .order_by("consumer_id", "-product_id")
+        .values_list("consumer_id", "product_id")
+        .iterator(chunk_size=5000)
+    )
+    pending, count = [], 0
+    current_user, liked = None, []
+
+    def flush():
+        nonlocal pending
+        if not pending:
+            return
+        with transaction.atomic():
+            # 재계산 도중 찜 변경으로 이미 새로 저장된 벡터는 그대로 둠
+            fresh = set(
+                UserTasteVector.objects
+                .filter(user_id__in=[t.user_id for t in pending], snapshot_version=version, updated_at__gte=started)
+                .values_list("user_id", flat=True)
+            )
+            pending = [t for t in pending if t.user_id not in fresh]
+            user_ids = [t.user_id for t in pending]
+            UserTasteVector.objects.filter(user_id__in=user_ids).delete()
+            UserTasteVector.objects.bulk_create(pending)
+        # 벡터가 바뀐 유저의 추천 캐시 무효화
+        reco_cache.invalidate_user_ids(user_ids)
+        pending = []
+
+    # 마지막 유저까지 저장되도록 끝 표시를 붙임
+    for user_id, product_id in chain(wishlist, [(None, None)]):
+        if user_id != current_user:
+            if current_user is not None:
+                u = _compute(liked[:MAX_LIKED], store, features)
+                pending.append(UserTasteVector(
+                    user_id=current_user, vector=_to_bytes(u),
+                    liked_ids=liked[:MAX_LIKED], snapshot_version=version,
+                ))
+                count += 1
+                if len(pending) >= batch_size:
+                    flush()
+            current_user, liked = user_id, []
+        liked.append(product_id)
+    flush()
+
+    # 찜 목록이 비어버린 유저의 오래된 벡터 정리
+    UserTasteVector.objects.exclude(snapshot_version=version).delete()
+    return count
@@ -0,0 +1,27 @@
+from celery import shared_task
+
+from project.db_router import use_replica
+
+from .services.taste import rebuild_all_tastes
+from .services.batch_reco import precompute_recommendations
+
+
+@shared_task
+def rebuild_user_tastes():
+    # 취향 벡터는 추천의 기준 데이터라서 찜 목록도 primary 에서 읽음
+    # (지연된 replica 로 계산하면 그 사이 찜 변경으로 저장된 더 최신 벡터를 덮어씀)
+    count = rebuild_all_tastes()
+
+    return f"{count}명의 취향 벡터를 다시 계산했습니다."
+
+
+@shared_task(bind=True)
+def precompute_user_recommendations(self):
+    def progress(done, total):
+        self.update_state(state="PROGRESS", meta={"done": done, "total": total})
+
+    # 미리 계산된 후보는 참고용 (요청 시 현재 상태로 다시 거름) -> replica 에서 읽어도 됨
+    with use_replica(sticky=False):
+        stats = precompute_recommendations(progress=progress)
+
+    return f"{stats['users']}명 추천 후보 계산 완료 ({stats['users_per_second']:.0f} users/s)"
@@ -0,0 +1,72 @@
+import shutil
+import tempfile
+from unittest import mock
+
+import numpy as np
+from django.core.cache import cache
+from django.test import TestCase
+
+from products.models import Wishlist
+from products.serializers import ProductReadSerializer
+from project.query_budget import query_budget
+from project.testing import QueryBudgetTestCase, make_store_with_products, make_user
+
+from .services import reco
+from .services.embedding_store import SnapshotReader, publish_snapshot
+from .services.reco_cache import cache_key, cached_recommend_for_user, location_cell
+from .services.taste import update_user_taste
+
+
+# 추천 캐시 적중 시 상품 / 가게 / 카테고리를 한 번에 읽는지 (N+1 회귀 방지)
+class CachedRecommendQueryTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.products = [make_store_with_products()[1][0] for _ in range(10)]
+        cls.consumer = make_user()
+
+    def setUp(self):
+        cache.clear()
+        reco.get_store()
+        key = cache_key(self.consumer.id, reco.SNAPSHOTS.version, location_cell(None, None))
+        cache.set(key, [product.id for product in self.products])
+
+    def test_cache_hit_uses_one_query(self):
+        with query_budget(1):
+            products = cached_recommend_for_user(self.consumer, limit=10)
+            data = ProductReadSerializer(products, many=True).data
+        self.assertEqual(len(data), 10)
+
+
+# 추천 API 가 ConsumerViewSet.query_budgets 안에서 끝나는지 (캐시 없음 / 캐시 적중 모두)
+class RecommendQueryBudgetTests(QueryBudgetTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.products = []
+        for i in range(5):
+            cls.products += make_store_with_products(8, {"latitude": 37.5 + i * 0.001})[1]
+        cls.consumer = make_user()
+        Wishlist.objects.bulk_create(Wishlist(consumer=cls.consumer, product=p) for p in cls.products[:3])
+
+    def setUp(self):
+        # 테스트 전용 스냅샷 (임의 벡터)
+        base_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, base_dir)
+        ids = np.array([p.id for p in self.products], dtype=np.int64)
+        vectors = np.random.default_rng(0).normal(size=(len(ids), 16)).astype("float32")
+        publish_snapshot(base_dir, ids, vectors, model="test")
+        patcher = mock.patch.object(reco, "SNAPSHOTS", SnapshotReader(base_dir))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        cache.clear()
+        update_user_taste(self.consumer)
+        # 특성 테이블은 만들어 둔 상태에서 변경분 갱신 주기가 된 요청으로 측정
+        reco._FEATURES.checked_at = 0.0
+        self.client = self.budget_client(self.consumer)
+
+    def test_recommends(self):
+        for label in ("miss", "hit"):
+            with self.subTest(label):
+                response = self.client.get("/accounts/consumer/recommends/", {"lat": 37.5, "lng": 127.0})
+                self.assertWithinBudget(response)
+                self.assertTrue(response.data)
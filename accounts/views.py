@@ -15,12 +15,17 @@ from products.serializers import ProductReadSerializer
 
 from accounts.permissions import IsConsumer     
 
-from accounts.services.reco import recommend_for_user  
+from accounts.services.reco_cache import cached_recommend_for_user
+from project.db_router import ReplicaReadMixin
 
 
 # (1) 소비자
 User = get_user_model()
-class ConsumerViewSet(viewsets.GenericViewSet):
+class ConsumerViewSet(ReplicaReadMixin, viewsets.GenericViewSet):
+    replica_actions = ("recommends",)
+    # 요청당 최대 SQL 쿼리 수 (인증 + 추천 특성 테이블 변경분 갱신 포함, project.query_budget)
+    # 스냅샷이 바뀐 직후 첫 요청은 특성 테이블 / 취향 벡터를 다시 만들어서 넘을 수 있음 (경고 로그)
+    query_budgets = {"me": 2, "recommends": 8}
     serializer_class = ConsumerSerializer
     queryset = User.objects.filter(role='consumer')
 
@@ -87,7 +92,7 @@ class ConsumerViewSet(viewsets.GenericViewSet):
             lat = lng = None
         
         # 추천 함수 호출
-        products = recommend_for_user(
+        products = cached_recommend_for_user(
             user,
             limit=10,
             user_lat=lat,
@@ -0,0 +1,48 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.test import RequestFactory
+
+from products.models import Product
+from products.serializers import ProductReadSerializer
+from products.services.product_rows import product_values, serialize_product_rows
+from stores.utils.spatial import annotate_distance
+
+
+# ProductReadSerializer 와 빠른 직렬화(services.product_rows)의 행/초 비교 (현재 DB 의 최신 상품, 읽기만)
+# 두 결과가 같은지는 products.tests 에서 확인
+class Command(BaseCommand):
+    help = "Benchmark ProductReadSerializer against the fast values() row serializer"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=500, help="Products per listing")
+        parser.add_argument("--repeat", type=int, default=20)
+
+    def handle(self, *args, **options):
+        ids = list(Product.objects.order_by("-id").values_list("id", "store_id")[:options["rows"]])
+        if not ids:
+            raise CommandError("no products to serialize")
+
+        # 근처 목록처럼 가게별 거리를 붙인 queryset
+        store_ids = sorted({store_id for _, store_id in ids})
+        queryset = annotate_distance(
+            Product.objects.filter(id__in=[pid for pid, _ in ids]).order_by("-id"),
+            store_ids, [0.1 * i for i in range(len(store_ids))],
+        )
+        request = RequestFactory().get("/products/nearby/")
+
+        paths = (
+            ("drf", lambda: ProductReadSerializer(
+                queryset.select_related("store", "category"), many=True, context={"request": request},
+            ).data),
+            ("fast", lambda: serialize_product_rows(product_values(queryset), request)),
+        )
+        for label, serialize in paths:
+            started = time.perf_counter()
+            for _ in range(options["repeat"]):
+                rows = len(serialize())
+            elapsed = time.perf_counter() - started
+            self.stdout.write(
+                f"{label:5s} {rows} rows x {options['repeat']}: {elapsed * 1000 / options['repeat']:7.2f} ms/listing, "
+                f"{rows * options['repeat'] / elapsed:10.0f} rows/s"
+            )
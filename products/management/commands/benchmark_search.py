@@ -0,0 +1,79 @@
+import random
+import sqlite3
+import time
+
+from django.core.management.base import BaseCommand
+from products.services.search import CREATE_TABLE, TABLE, match_expression
+
+
+WORDS = [
+    "서울우유", "바나나", "딸기", "샌드위치", "김밥", "도시락", "크루아상", "베이글", "치즈케이크",
+    "아메리카노", "샐러드", "닭가슴살", "요거트", "식빵", "소보로", "단팥빵", "떡볶이", "만두",
+    "milk", "bread", "salad", "cookie", "donut", "muffin",
+]
+CATEGORIES = ["베이커리", "반찬", "음료", "과일", "도시락", "디저트"]
+
+
+# icontains(LIKE '%...%' + 가게 조인) 와 FTS5 trigram 검색 비교 (메모리 DB, 합성 데이터)
+class Command(BaseCommand):
+    help = "Benchmark LIKE scans against the FTS5 product search index"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--products", type=int, default=100_000)
+        parser.add_argument("--stores", type=int, default=2_000)
+        parser.add_argument("--queries", type=int, default=50)
+
+    def handle(self, *args, **options):
+        rng = random.Random(0)
+        db = sqlite3.connect(":memory:")
+        db.execute("CREATE TABLE store (id INTEGER PRIMARY KEY, store_name TEXT)")
+        db.execute(
+            "CREATE TABLE product (id INTEGER PRIMARY KEY, store_id INTEGER, "
+            "name TEXT, description TEXT, category TEXT)"
+        )
+        db.execute(CREATE_TABLE)
+
+        stores = [(i, f"{rng.choice(WORDS)} 가게 {i}") for i in range(options["stores"])]
+        db.executemany("INSERT INTO store VALUES (?, ?)", stores)
+        products = []
+        for i in range(options["products"]):
+            name = f"{rng.choice(WORDS)} {rng.choice(WORDS)} {rng.randint(1, 999)}"
+            description = " ".join(rng.choice(WORDS) for _ in range(6))
+            products.append((i, rng.randrange(len(stores)), name, description, rng.choice(CATEGORIES)))
+        db.executemany("INSERT INTO product VALUES (?, ?, ?, ?, ?)", products)
+
+        started = time.perf_counter()
+        db.execute(
+            f"INSERT INTO {TABLE} (rowid, name, description, store_name, category_name) "
+            "SELECT p.id, p.name, p.description, s.store_name, p.category "
+            "FROM product p JOIN store s ON s.id = p.store_id"
+        )
+        self.stdout.write(f"indexed {len(products)} products in {time.perf_counter() - started:.2f}s")
+
+        # trigram 인덱스는 3글자 이상 검색어만 처리 (짧은 검색어는 실제 서비스에서도 LIKE)
+        indexable = [word for word in WORDS if len(word) >= 3]
+        queries = [rng.choice(indexable)[:rng.randint(3, 4)] for _ in range(options["queries"])]
+
+        like_sql = (
+            "SELECT p.id FROM product p JOIN store s ON s.id = p.store_id "
+            "WHERE p.name LIKE ? OR p.description LIKE ? OR s.store_name LIKE ? OR p.category LIKE ?"
+        )
+        started = time.perf_counter()
+        like_hits = [
+            {row[0] for row in db.execute(like_sql, [f"%{q}%"] * 4)}
+            for q in queries
+        ]
+        like_ms = (time.perf_counter() - started) * 1000 / len(queries)
+
+        match_sql = f"SELECT rowid FROM {TABLE} WHERE {TABLE} MATCH ?"
+        started = time.perf_counter()
+        fts_hits = [
+            {row[0] for row in db.execute(match_sql, [match_expression([q])])}
+            for q in queries
+        ]
+        fts_ms = (time.perf_counter() - started) * 1000 / len(queries)
+
+        same = sum(a == b for a, b in zip(like_hits, fts_hits))
+        self.stdout.write(f"LIKE scan : {like_ms:8.2f} ms/query")
+        self.stdout.write(f"FTS5 index: {fts_ms:8.2f} ms/query ({like_ms / max(fts_ms, 1e-9):.1f}x)")
+        self.stdout.write(f"identical results: {same}/{len(queries)}")
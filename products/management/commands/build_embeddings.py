@@ -1,39 +1,151 @@
 from django.core.management.base import BaseCommand
 from django.conf import settings
+import hashlib
+import time
 import numpy as np
-from openai import OpenAI
 from products.models import Product
+from products.services.embedder import get_embedder
+from accounts.services.embedding_store import open_snapshot, publish_snapshot
 import os
 
-def build_all_embeddings():
-    client = OpenAI(api_key=settings.OPENAI_API_KEY)
+
+def product_text(p):
+    return f"{p.name} {p.store.store_name} {getattr(p.category, 'name', '') or ''}"
+
+
+# 임베딩 입력 텍스트 해시 (변경 감지용)
+def text_hash(text):
+    digest = hashlib.blake2b(text.encode("utf-8"), digest_size=8).digest()
+    return np.frombuffer(digest, dtype=np.uint64)[0]
+
+
+def build_all_embeddings(full=False, embedder=None):
     os.makedirs(settings.EMBEDDINGS_DIR, exist_ok=True)
 
-    products = Product.objects.filter(is_active=True, stock__gt=0)
-    if not products.exists():
-        print("No active products found.")
-        return
+    products = (
+        Product.objects
+        .filter(is_active=True, stock__gt=0)
+        .select_related("store", "category")
+        .only("id", "name", "store__store_name", "category__name")
+    )
 
-    ids, vecs = [], []
+    current = {}
     for p in products:
-        text = f"{p.name} {p.store.store_name} {getattr(p.category, 'name', '') or ''}"
-        try:
-            res = client.embeddings.create(model="text-embedding-3-small", input=text)
-            vec = res.data[0].embedding
-            ids.append(p.id)
-            vecs.append(vec)
-        except Exception as e:
-            print(f"Failed for product {p.id}: {e}")
-
-    if ids and vecs:
-        np.save(settings.EMBEDDINGS_DIR / "product_ids.npy", np.array(ids, dtype=np.int64))
-        np.save(settings.EMBEDDINGS_DIR / "product_vectors.npy", np.array(vecs, dtype="float32"))
-        print(f"Saved {len(ids)} embeddings to {settings.EMBEDDINGS_DIR}")
-    else:
+        text = product_text(p)
+        current[p.id] = (text, text_hash(text))
+
+    if embedder is None:
+        embedder = get_embedder()
+
+    # 기존 스냅샷 (full 이거나 모델이 바뀌었으면 무시하고 전체 재생성)
+    manifest, store, meta = open_snapshot(settings.EMBEDDINGS_DIR)
+    if (
+        full
+        or store.model != embedder.model
+        or "text_hash" not in meta
+        or "embedded_at" not in meta
+    ):
+        store, meta = None, {}
+
+    kept_ids, kept_rows, kept_hashes, kept_times = [], [], [], []
+    to_embed = []
+    for pid, (text, h) in current.items():
+        row = store.row(pid) if store is not None else None
+        if row is not None and meta["text_hash"][row] == h:
+            kept_ids.append(pid)
+            kept_rows.append(row)
+            kept_hashes.append(h)
+            kept_times.append(meta["embedded_at"][row])
+        else:
+            to_embed.append(pid)
+
+    # 비활성 / 재고 0 이 된 상품은 스냅샷에서 제외
+    dropped = 0
+    if store is not None:
+        dropped = int((~np.isin(store.ids, list(current))).sum())
+
+    # 양자화 / PCA 설정이 바뀌었으면 새로 임베딩할 상품이 없어도 다시 저장
+    pca_components = settings.EMBEDDING_PCA_COMPONENTS or None
+    quantize = settings.EMBEDDING_QUANTIZATION or None
+    layout_changed = manifest is not None and (
+        manifest.get("quantized") != quantize
+        or (manifest.get("pca") or {}).get("components") != pca_components
+    )
+    if manifest is not None and not to_embed and not dropped and not layout_changed:
+        print(f"Embeddings are up to date ({len(kept_ids)} products).")
+        return None
+
+    new_ids, new_vecs, new_hashes = [], [], []
+    embedded = embedder.embed([current[pid][0] for pid in to_embed])
+    for pid, vec in zip(to_embed, embedded):
+        if vec is None:
+            print(f"Failed for product {pid}")
+            continue
+        new_ids.append(pid)
+        new_vecs.append(vec)
+        new_hashes.append(current[pid][1])
+
+    ids = kept_ids + new_ids
+    if current and not ids:
         print("No embeddings were created. Check API key or product queryset.")
+        return
+
+    # 재사용하는 벡터는 PCA 적용 전 원본에서 가져옴
+    vecs = []
+    if kept_rows:
+        source = store.raw if store.raw is not None else store
+        vecs.append(np.asarray(source.vectors[kept_rows], dtype="float32"))
+    if new_vecs:
+        vecs.append(np.array(new_vecs, dtype="float32"))
+    # 활성 상품이 하나도 없으면 빈 스냅샷을 게시 (이전 스냅샷의 상품이 계속 추천되지 않도록)
+    if not vecs:
+        vecs.append(np.empty((0, store.dim if store is not None else 0), dtype="float32"))
+
+    now = time.time()
+    version = publish_snapshot(
+        settings.EMBEDDINGS_DIR,
+        np.array(ids, dtype=np.int64),
+        np.concatenate(vecs),
+        meta={
+            "text_hash": np.array(kept_hashes + new_hashes, dtype=np.uint64),
+            "embedded_at": np.array(kept_times + [now] * len(new_ids), dtype=np.float64),
+        },
+        model=embedder.model,
+        build_index=settings.RECO_ANN_INDEX,
+        quantize=quantize,
+        pca_components=pca_components,
+    )
+    print(
+        f"Saved {len(ids)} embeddings to {settings.EMBEDDINGS_DIR} (snapshot {version}): "
+        f"{len(new_ids)} embedded, {len(kept_ids)} reused, {dropped} dropped"
+    )
+    return version
+
 
 class Command(BaseCommand):
-    help = "Build product embeddings using OpenAI"
+    help = "Build product embeddings (incremental by default)"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--full", action="store_true",
+            help="Re-embed every active product instead of only new or changed ones",
+        )
+        parser.add_argument(
+            "--backend", choices=["openai", "local"], default=None,
+            help="Embedding backend (defaults to settings.EMBEDDING_BACKEND)",
+        )
+        parser.add_argument("--batch-tokens", type=int, default=8000, help="Token budget per request (openai)")
+        parser.add_argument("--workers", type=int, default=4, help="Concurrent embedding requests (openai)")
+        parser.add_argument("--processes", type=int, default=None, help="Encoding processes (local)")
 
     def handle(self, *args, **options):
-        build_all_embeddings()
+        backend = options["backend"] or settings.EMBEDDING_BACKEND
+        if backend == "openai":
+            embedder = get_embedder(
+                backend,
+                max_batch_tokens=options["batch_tokens"],
+                max_workers=options["workers"],
+            )
+        else:
+            embedder = get_embedder(backend, processes=options["processes"])
+        build_all_embeddings(full=options["full"], embedder=embedder)
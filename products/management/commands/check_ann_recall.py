@@ -0,0 +1,45 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.conf import settings
+import numpy as np
+from accounts.services.embedding_store import open_snapshot
+
+
+# 근사 검색(IVF)과 전체 내적 검색의 recall@k 비교
+# 스냅샷의 상품 벡터를 무작위로 골라 질의로 사용한다
+def ann_recall(store, queries=200, k=10, nprobe=None, seed=0):
+    nprobe = nprobe or settings.RECO_ANN_NPROBE
+    rng = np.random.default_rng(seed)
+    picks = rng.choice(len(store), min(queries, len(store)), replace=False)
+
+    hits = 0
+    for row in picks:
+        u = np.asarray(store.vectors[row], dtype="float32")
+        exact = np.argsort(-(store.vectors @ u))[:k]
+        approx, _ = store.index.search(store.vectors, u, k=k, nprobe=nprobe)
+        hits += len(np.intersect1d(exact, approx))
+    return hits / (len(picks) * min(k, len(store)))
+
+
+class Command(BaseCommand):
+    help = "Measure recall@k of the ANN index against exact search"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--queries", type=int, default=200)
+        parser.add_argument("-k", type=int, default=10)
+        parser.add_argument("--nprobe", type=int, default=None)
+        parser.add_argument("--min-recall", type=float, default=None, help="Fail if recall is below this")
+
+    def handle(self, *args, **options):
+        manifest, store, _ = open_snapshot(settings.EMBEDDINGS_DIR)
+        if manifest is None or not len(store):
+            raise CommandError("No embedding snapshot found.")
+        if store.index is None:
+            raise CommandError(f"Snapshot {manifest['version']} has no ANN index.")
+
+        recall = ann_recall(store, options["queries"], options["k"], options["nprobe"])
+        self.stdout.write(
+            f"snapshot {manifest['version']}: {len(store)} vectors, nlist={store.index.nlist}, "
+            f"recall@{options['k']}={recall:.3f}"
+        )
+        if options["min_recall"] is not None and recall < options["min_recall"]:
+            raise CommandError(f"recall {recall:.3f} < {options['min_recall']}")
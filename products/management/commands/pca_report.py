@@ -0,0 +1,46 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.conf import settings
+import numpy as np
+from accounts.services.embedding_store import open_snapshot
+from accounts.services.pca import PCAProjection
+
+
+# PCA 차원 수별 설명 분산과 전체 차원 순위와의 top-k 일치도
+class Command(BaseCommand):
+    help = "Report explained variance and top-k agreement of PCA-reduced embeddings"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--components", type=int, nargs="+", default=[64, 128, 256, 512])
+        parser.add_argument("--queries", type=int, default=200)
+        parser.add_argument("-k", type=int, default=10)
+
+    def handle(self, *args, **options):
+        manifest, store, _ = open_snapshot(settings.EMBEDDINGS_DIR)
+        if manifest is None or not len(store):
+            raise CommandError("No embedding snapshot found.")
+
+        full = np.asarray((store.raw if store.raw is not None else store).vectors, dtype="float32")
+        if manifest.get("pca"):
+            pca = manifest["pca"]
+            self.stdout.write(
+                f"snapshot {manifest['version']} uses PCA {pca['input_dim']} -> {pca['components']} "
+                f"(explained variance {pca['explained_variance']:.3f})"
+            )
+
+        k = options["k"]
+        rng = np.random.default_rng(0)
+        picks = rng.choice(len(full), min(options["queries"], len(full)), replace=False)
+        exact_top = [np.argsort(-(full @ full[i]))[:k] for i in picks]
+
+        for n in options["components"]:
+            projection = PCAProjection.fit(full, n)
+            reduced = projection.transform(full)
+            overlap = sum(
+                len(np.intersect1d(np.argsort(-(reduced @ reduced[i]))[:k], expected))
+                for i, expected in zip(picks, exact_top)
+            )
+            self.stdout.write(
+                f"{full.shape[1]} -> {projection.n_components}: "
+                f"explained variance {projection.explained_variance:.3f}, "
+                f"top-{k} agreement {overlap / (len(picks) * min(k, len(full))):.3f}"
+            )
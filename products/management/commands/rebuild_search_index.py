@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+from products.services.search import fts_enabled, rebuild_search_index
+
+
+# 상품 검색 인덱스 전체 재색인 (signal 을 거치지 않은 대량 변경 후 실행)
+class Command(BaseCommand):
+    help = "Rebuild the product full-text search index"
+
+    def handle(self, *args, **options):
+        if not fts_enabled():
+            self.stdout.write("Search index is only used on SQLite; nothing to do.")
+            return
+        count = rebuild_search_index()
+        self.stdout.write(f"indexed {count} products")
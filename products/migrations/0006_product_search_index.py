@@ -0,0 +1,36 @@
+from django.db import migrations
+
+
+# SQLite 에서만 FTS5 검색 테이블 생성 + 기존 상품 색인
+def create_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor != "sqlite":
+        return
+    schema_editor.execute(
+        "CREATE VIRTUAL TABLE IF NOT EXISTS product_search "
+        "USING fts5(name, description, store_name, category_name, tokenize='trigram')"
+    )
+    schema_editor.execute(
+        "INSERT INTO product_search (rowid, name, description, store_name, category_name) "
+        "SELECT p.id, p.name, p.description, s.store_name, c.name "
+        "FROM products_product p "
+        "JOIN stores_store s ON s.id = p.store_id "
+        "JOIN categories_category c ON c.id = p.category_id"
+    )
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor == "sqlite":
+        schema_editor.execute("DROP TABLE IF EXISTS product_search")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('categories', '0002_auto_add_initial_data'),
+        ('stores', '0004_store_geo_cell'),
+        ('products', '0005_product_image_alter_product_category_and_more'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
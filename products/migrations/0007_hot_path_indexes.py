@@ -0,0 +1,27 @@
+# Generated by Django 5.2.4 on 2026-10-17 17:39
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('categories', '0002_auto_add_initial_data'),
+        ('products', '0006_product_search_index'),
+        ('stores', '0004_store_geo_cell'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='product',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['store', '-id'], name='product_active_store_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='product',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['expiration_date'], name='product_active_expiry_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='product',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['discount_rate'], name='product_active_discount_idx'),
+        ),
+    ]
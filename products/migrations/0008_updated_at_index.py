@@ -0,0 +1,19 @@
+# Generated by Django 5.2.4 on 2026-10-17 18:14
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('categories', '0002_auto_add_initial_data'),
+        ('products', '0007_hot_path_indexes'),
+        ('stores', '0005_updated_at_index'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='product',
+            index=models.Index(fields=['updated_at'], name='product_updated_idx'),
+        ),
+    ]
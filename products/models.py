@@ -1,5 +1,17 @@
 from django.db import models
 
+
+class ProductQuerySet(models.QuerySet):
+    # since 이후 상품 또는 그 가게가 바뀐 상품 (워커 메모리 인덱스 변경분)
+    # 가게 조건은 서브쿼리로 -> 두 updated_at 인덱스를 각각 사용 (조인 OR 는 전체 스캔)
+    def changed_since(self, since):
+        from stores.models import Store
+        return self.filter(
+            models.Q(updated_at__gte=since)
+            | models.Q(store__in=Store.objects.filter(updated_at__gte=since).values("id"))
+        )
+
+
 class Product(models.Model):
     # 판매자 - 가게 1:1 관계 
     store = models.ForeignKey('stores.Store', on_delete=models.CASCADE, related_name='products')
@@ -16,6 +28,20 @@ class Product(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = ProductQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            # 가게별 활성 상품 최신순 (근처 / 가게 상품 목록)
+            models.Index(fields=["store", "-id"], condition=models.Q(is_active=True), name="product_active_store_idx"),
+            # 유통기한 만료 작업 (30초마다)
+            models.Index(fields=["expiration_date"], condition=models.Q(is_active=True), name="product_active_expiry_idx"),
+            # 특가 상품 목록
+            models.Index(fields=["discount_rate"], condition=models.Q(is_active=True), name="product_active_discount_idx"),
+            # 워커 메모리 인덱스의 변경분 조회 (updated_at >= 마지막 동기화)
+            models.Index(fields=["updated_at"], name="product_updated_idx"),
+        ]
+
     def __str__(self):
         return f"[{self.id}] {self.name} ({self.is_active}) / 가게명 : {self.store.store_name}"
 
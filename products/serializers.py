@@ -7,6 +7,8 @@ class ProductReadSerializer(serializers.ModelSerializer):
     store_name = serializers.CharField(source="store.store_name", read_only=True)
     category_name = serializers.CharField(source="category.name", read_only=True)
     store = serializers.SerializerMethodField()
+    # 근처 / 특가 목록에서 annotate 된 가게까지 거리 (없으면 응답에서 빠짐)
+    distance_km = serializers.FloatField(read_only=True)
 
     def get_store(self, obj):                 
         store = obj.store
@@ -24,7 +26,7 @@ class ProductReadSerializer(serializers.ModelSerializer):
             "image", "name", "description",
             "price", "discount_price", "discount_rate",
             "stock", "expiration_date", "is_active",
-            "created_at", "updated_at",
+            "created_at", "updated_at", "distance_km",
         ]
         read_only_fields = ["id", "store", "is_active", "created_at", "updated_at"]
 
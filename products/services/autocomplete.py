@@ -0,0 +1,226 @@
+import heapq
+import threading
+from bisect import bisect_left, insort
+
+from django.db.models import Count
+
+from products.models import Product, Wishlist
+from project.worker_index import WorkerIndex
+from reservations.models import Reservation
+from stores.models import Store
+
+# ------------------------------------------------
+# 상품명 / 가게명 자동완성 (워커 메모리 정렬 배열 + bisect 접두사 검색)
+#
+# 이름을 자모 단위로 풀어서(과 -> ㄱㅗㅏ) 키로 저장하므로 입력 중인 글자도 맞는다.
+#   "서울웅" (서울우유 입력 중) -> ㅅㅓㅇㅜㄹㅇㅜㅇ 은 ㅅㅓㅇㅜㄹㅇㅜㅇㅠ 의 접두사
+# 이름의 각 단어 시작 위치와 초성(ㅅㅇㅇㅇ)도 키로 넣어서 중간 단어 / 초성 검색도 지원.
+# 결과는 인기도(찜 수 + 예약 수) 순.
+# 처음 한 번 전체를 읽고, 이후에는 updated_at 기준으로 바뀐 상품 / 가게만 반영한다.
+# (인기도 반영과 삭제된 항목 정리는 주기적인 전체 재생성으로)
+
+HANGUL_BASE = 0xAC00
+HANGUL_LAST = 0xD7A3
+CHOSEONG = "ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ"
+JUNGSEONG = [
+    "ㅏ", "ㅐ", "ㅑ", "ㅒ", "ㅓ", "ㅔ", "ㅕ", "ㅖ", "ㅗ", "ㅗㅏ", "ㅗㅐ", "ㅗㅣ", "ㅛ", "ㅜ",
+    "ㅜㅓ", "ㅜㅔ", "ㅜㅣ", "ㅠ", "ㅡ", "ㅡㅣ", "ㅣ",
+]
+JONGSEONG = [
+    "", "ㄱ", "ㄲ", "ㄱㅅ", "ㄴ", "ㄴㅈ", "ㄴㅎ", "ㄷ", "ㄹ", "ㄹㄱ", "ㄹㅁ", "ㄹㅂ", "ㄹㅅ", "ㄹㅌ",
+    "ㄹㅍ", "ㄹㅎ", "ㅁ", "ㅂ", "ㅂㅅ", "ㅅ", "ㅆ", "ㅇ", "ㅈ", "ㅊ", "ㅋ", "ㅌ", "ㅍ", "ㅎ",
+]
+# 입력창에 낱자로 들어온 겹자모
+COMPOUND_JAMO = {
+    "ㄳ": "ㄱㅅ", "ㄵ": "ㄴㅈ", "ㄶ": "ㄴㅎ", "ㄺ": "ㄹㄱ", "ㄻ": "ㄹㅁ", "ㄼ": "ㄹㅂ", "ㄽ": "ㄹㅅ",
+    "ㄾ": "ㄹㅌ", "ㄿ": "ㄹㅍ", "ㅀ": "ㄹㅎ", "ㅄ": "ㅂㅅ", "ㅘ": "ㅗㅏ", "ㅙ": "ㅗㅐ", "ㅚ": "ㅗㅣ",
+    "ㅝ": "ㅜㅓ", "ㅞ": "ㅜㅔ", "ㅟ": "ㅜㅣ", "ㅢ": "ㅡㅣ",
+}
+
+# 이름 하나에서 키를 만들 최대 단어 수
+MAX_WORDS = 5
+# 긴 접두사 검색에서 훑는 최대 키 수
+MAX_SCAN = 2000
+# 이 길이(자모 수) 이하 접두사는 범위 전체를 인기도 순으로 골라 결과를 캐시
+# (첫 글자 입력처럼 걸리는 키가 많을 때 앞쪽 키만 보면 인기 항목이 빠짐)
+SHORT_PREFIX = 3
+
+PRODUCT = "product"
+STORE = "store"
+
+
+def decompose(text):
+    out = []
+    for ch in text.lower():
+        code = ord(ch)
+        if HANGUL_BASE <= code <= HANGUL_LAST:
+            offset = code - HANGUL_BASE
+            out.append(CHOSEONG[offset // 588])
+            out.append(JUNGSEONG[(offset % 588) // 28])
+            out.append(JONGSEONG[offset % 28])
+        else:
+            out.append(COMPOUND_JAMO.get(ch, ch))
+    return "".join(out)
+
+
+def initials(text):
+    out = []
+    for ch in text.lower():
+        code = ord(ch)
+        if HANGUL_BASE <= code <= HANGUL_LAST:
+            out.append(CHOSEONG[(code - HANGUL_BASE) // 588])
+        elif not ch.isspace():
+            out.append(ch)
+    return "".join(out)
+
+
+# 이름 -> 검색 키 (단어 시작 위치마다 공백을 뺀 자모 / 초성 문자열)
+def keys_for(name):
+    words = name.split()[:MAX_WORDS]
+    keys = set()
+    for i in range(len(words)):
+        rest = "".join(words[i:])
+        keys.add(decompose(rest))
+        keys.add(initials(rest))
+    keys.discard("")
+    return keys
+
+
+class PrefixIndex:
+    def __init__(self):
+        self.keys = []          # 정렬된 (키, 종류, id)
+        self.entries = {}       # (종류, id) -> (이름, 인기도, 키 목록)
+        self._short = {}        # 짧은 접두사 검색 결과
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.entries)
+
+    def _remove(self, kind, item_id):
+        entry = self.entries.pop((kind, item_id), None)
+        if entry is None:
+            return
+        for key in entry[2]:
+            i = bisect_left(self.keys, (key, kind, item_id))
+            if i < len(self.keys) and self.keys[i] == (key, kind, item_id):
+                del self.keys[i]
+
+    def remove(self, kind, item_id):
+        with self._lock:
+            self._short.clear()
+            self._remove(kind, item_id)
+
+    def upsert(self, kind, item_id, name, popularity, visible):
+        with self._lock:
+            self._short.clear()
+            self._remove(kind, item_id)
+            if not visible or not name:
+                return
+            keys = keys_for(name)
+            self.entries[(kind, item_id)] = (name, popularity, keys)
+            for key in keys:
+                insort(self.keys, (key, kind, item_id))
+
+    # 전체 생성 시에는 한 번에 정렬
+    def load(self, items):
+        with self._lock:
+            self._short.clear()
+            for kind, item_id, name, popularity, visible in items:
+                if visible and name:
+                    self.entries[(kind, item_id)] = (name, popularity, keys_for(name))
+            self.keys = sorted(
+                (key, kind, item_id)
+                for (kind, item_id), (_, _, keys) in self.entries.items()
+                for key in keys
+            )
+
+    def search(self, query, limit=10, kind=None):
+        # 초성만 입력한 경우도 초성 키의 접두사가 되므로 같은 방식으로 찾음
+        prefix = decompose("".join(query.split()))
+        if not prefix:
+            return []
+
+        cache_key = (prefix, kind, limit)
+        with self._lock:
+            cached = self._short.get(cache_key)
+            if cached is not None:
+                return cached
+
+            # 접두사 범위 [prefix, prefix + 최대 문자) 를 bisect 로 한 번에 자름
+            start = bisect_left(self.keys, (prefix,))
+            end = bisect_left(self.keys, (prefix + "\uffff",))
+            if len(prefix) > SHORT_PREFIX:
+                end = min(end, start + MAX_SCAN)
+            found = {
+                (item_kind, item_id)
+                for _, item_kind, item_id in self.keys[start:end]
+                if kind is None or item_kind == kind
+            }
+            ranked = heapq.nsmallest(limit, found, key=lambda k: (-self.entries[k][1], self.entries[k][0]))
+            results = [
+                {"type": item_kind, "id": item_id, "name": self.entries[(item_kind, item_id)][0]}
+                for item_kind, item_id in ranked
+            ]
+            # 짧은 접두사는 걸리는 항목이 많아 결과를 기억해 둠 (인덱스가 바뀌면 비움)
+            if len(prefix) <= SHORT_PREFIX:
+                self._short[cache_key] = results
+            return results
+
+
+# ------------------------------------------------
+# DB -> 인덱스
+
+
+def _product_items(products):
+    rows = list(products.values_list("id", "name", "is_active", "store__is_open"))
+    ids = [row[0] for row in rows]
+    popularity = dict.fromkeys(ids, 0)
+    # id 목록 대신 서브쿼리로 (전체 생성 시 SQLite 변수 개수 제한)
+    subquery = products.values("id")
+    for counts in (
+        Wishlist.objects.filter(product_id__in=subquery).values("product_id").annotate(n=Count("id")),
+        Reservation.objects.filter(product_id__in=subquery).values("product_id").annotate(n=Count("id")),
+    ):
+        for row in counts:
+            popularity[row["product_id"]] += row["n"]
+    return [
+        (PRODUCT, pid, name, popularity[pid], is_active and is_open)
+        for pid, name, is_active, is_open in rows
+    ]
+
+
+def _store_items(stores):
+    rows = list(stores.values_list("id", "store_name", "is_open"))
+    ids = [row[0] for row in rows]
+    popularity = dict.fromkeys(ids, 0)
+    counts = (
+        Reservation.objects.filter(product__store_id__in=stores.values("id"))
+        .values("product__store_id").annotate(n=Count("id"))
+    )
+    for row in counts:
+        popularity[row["product__store_id"]] += row["n"]
+    return [(STORE, sid, name, popularity[sid], is_open) for sid, name, is_open in rows]
+
+
+def _build():
+    index = PrefixIndex()
+    index.load(_product_items(Product.objects.filter(is_active=True, store__is_open=True)))
+    index.load(_store_items(Store.objects.filter(is_open=True)))
+    return index
+
+
+def _update(index, since):
+    for item in _product_items(Product.objects.changed_since(since)) + _store_items(Store.objects.filter(updated_at__gte=since)):
+        index.upsert(*item)
+
+
+# 워커별 인덱스 (처음 사용할 때 생성)
+_INDEX = WorkerIndex(_build, _update, "AUTOCOMPLETE_REFRESH_SECONDS", "AUTOCOMPLETE_REBUILD_SECONDS")
+
+
+def get_autocomplete_index():
+    return _INDEX.get()
+
+
+def suggest(query, limit=10, kind=None):
+    return get_autocomplete_index().search(query, limit=limit, kind=kind)
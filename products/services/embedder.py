@@ -0,0 +1,152 @@
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from openai import APIConnectionError, InternalServerError, OpenAI, RateLimitError
+
+import logging
+logger = logging.getLogger(__name__)
+
+EMBEDDING_MODEL = "text-embedding-3-small"
+
+# 재시도할 일시적 오류 (rate limit / 타임아웃·연결 / 5xx)
+# 잘못된 요청·인증 오류 등은 다시 보내도 실패하므로 바로 올림
+RETRYABLE_ERRORS = (RateLimitError, APIConnectionError, InternalServerError)
+
+
+# 토큰 수 추정 (한글 1글자 ≒ 3바이트 ≒ 1~2토큰 -> 보수적으로 2바이트당 1토큰)
+def estimate_tokens(text):
+    return len(text.encode("utf-8")) // 2 + 1
+
+
+# 토큰 예산 / 최대 개수 기준으로 (시작 인덱스, 텍스트 목록) 배치 생성
+def make_batches(texts, max_batch_tokens, max_batch_size):
+    batches, start, tokens = [], 0, 0
+    for i, text in enumerate(texts):
+        t = estimate_tokens(text)
+        if i > start and (tokens + t > max_batch_tokens or i - start >= max_batch_size):
+            batches.append((start, texts[start:i]))
+            start, tokens = i, 0
+        tokens += t
+    if start < len(texts):
+        batches.append((start, texts[start:]))
+    return batches
+
+
+# ------------------------------------------------
+# OpenAI 임베딩 (배치 + 동시 요청 + 재시도)
+# client 를 주입하면 로컬 가짜 서버 / 테스트 더블로 벤치마크 가능
+class OpenAIEmbedder:
+    def __init__(
+        self,
+        client=None,
+        model=EMBEDDING_MODEL,
+        max_batch_tokens=8000,
+        max_batch_size=256,
+        max_workers=4,
+        max_retries=5,
+        backoff=1.0,
+        max_backoff=30.0,
+    ):
+        if client is None:
+            # 재시도는 여기서 직접 처리
+            client = OpenAI(
+                api_key=settings.OPENAI_API_KEY,
+                base_url=getattr(settings, "OPENAI_BASE_URL", None),
+                max_retries=0,
+            )
+        self.client = client
+        self.model = model
+        self.max_batch_tokens = max_batch_tokens
+        self.max_batch_size = max_batch_size
+        self.max_workers = max_workers
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+
+    def _create(self, batch):
+        for attempt in range(self.max_retries + 1):
+            try:
+                res = self.client.embeddings.create(model=self.model, input=batch)
+                return [d.embedding for d in sorted(res.data, key=lambda d: d.index)]
+            except RETRYABLE_ERRORS as e:
+                if attempt == self.max_retries:
+                    raise
+                # 지수 백오프 + jitter (rate limit 시 동시 배치들이 한꺼번에 재시도하지 않도록)
+                delay = min(self.max_backoff, self.backoff * 2 ** attempt)
+                delay *= random.uniform(0.5, 1.0)
+                logger.warning("embedding batch failed (%s), retry in %.1fs", e, delay)
+                time.sleep(delay)
+
+    # texts 와 같은 순서의 벡터 목록 반환, 실패한 배치의 항목은 None
+    def embed(self, texts):
+        texts = list(texts)
+        results = [None] * len(texts)
+        batches = make_batches(texts, self.max_batch_tokens, self.max_batch_size)
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            futures = [(start, batch, pool.submit(self._create, batch)) for start, batch in batches]
+            for start, batch, future in futures:
+                try:
+                    results[start:start + len(batch)] = future.result()
+                except Exception as e:
+                    logger.error("embedding batch %d-%d failed: %s", start, start + len(batch), e)
+        return results
+
+
+# ------------------------------------------------
+# 로컬 임베딩 (sentence-transformers, 외부 API 없음)
+# 모델은 처음 사용할 때 한 번만 로드, CPU 에서 큰 배치로 인코딩
+class LocalEmbedder:
+    def __init__(self, model=None, batch_size=None, processes=None):
+        self.model = model or settings.EMBEDDING_LOCAL_MODEL
+        self.batch_size = batch_size or settings.EMBEDDING_LOCAL_BATCH_SIZE
+        self.processes = processes or settings.EMBEDDING_LOCAL_PROCESSES
+        self._model = None
+
+    def _load(self):
+        if self._model is None:
+            # torch 로딩이 무거워서 로컬 백엔드를 쓸 때만 import
+            from sentence_transformers import SentenceTransformer
+            self._model = SentenceTransformer(self.model, device="cpu")
+        return self._model
+
+    def embed(self, texts):
+        texts = list(texts)
+        if not texts:
+            return []
+        model = self._load()
+
+        # 프로세스 풀로 카탈로그를 나눠서 인코딩
+        if self.processes > 1 and len(texts) > self.batch_size:
+            pool = model.start_multi_process_pool(["cpu"] * self.processes)
+            try:
+                vecs = model.encode(
+                    texts, pool=pool, batch_size=self.batch_size,
+                    normalize_embeddings=True, convert_to_numpy=True,
+                )
+            finally:
+                model.stop_multi_process_pool(pool)
+        else:
+            vecs = model.encode(
+                texts, batch_size=self.batch_size,
+                normalize_embeddings=True, convert_to_numpy=True,
+            )
+        return list(vecs.astype("float32"))
+
+
+EMBEDDING_BACKENDS = {
+    "openai": OpenAIEmbedder,
+    "local": LocalEmbedder,
+}
+
+
+# settings.EMBEDDING_BACKEND 에 맞는 임베더 생성
+def get_embedder(backend=None, **kwargs):
+    backend = backend or settings.EMBEDDING_BACKEND
+    try:
+        cls = EMBEDDING_BACKENDS[backend]
+    except KeyError:
+        raise ValueError(f"알 수 없는 임베딩 백엔드입니다: {backend}")
+    return cls(**kwargs)
@@ -0,0 +1,92 @@
+import hashlib
+import json
+
+from django.conf import settings
+from django.core.cache import cache
+
+from project.cache_counters import incr
+from stores.utils.cells import KM_PER_DEGREE, cells_covering
+from stores.utils.spatial import filter_radius, nearby_store_candidates, nearby_store_distances
+
+# ------------------------------------------------
+# 근처 / 특가 목록의 반경 안 가게 캐시
+#
+# 상품 목록 / 정렬 / 페이지는 항상 DB 키셋으로 읽고, 캐시에는 위치 칸마다
+# 가까운 가게 후보 (id, 좌표) 만 둔다. 거리 / 반경 필터는 매 요청 실제 좌표로 계산.
+# 키 : 위치 칸 + 반경 + 반경이 덮는 가게 격자 칸(Store.geo_cell)들의 버전 번호
+#   - 가게 목록은 칸 중심에서 (반경 + 칸 한 개 크기) 로 계산 -> 칸 안의 어느 위치에서
+#     요청해도 반경 안 가게가 빠지지 않고, 이웃 소비자끼리 같은 목록을 공유
+#   - 가게가 바뀌면 (저장, 오픈 토글, 이동, 삭제) 그 가게 칸의 버전을 올림
+#     -> 해당 칸을 덮는 목록만 새로 계산 (상품 변경은 DB 조회에 바로 반영되므로 무관)
+#   - 칸을 다 셀 수 없는 넓은 반경은 캐시하지 않음
+
+HIT_KEY = "listing:stats:hit"
+MISS_KEY = "listing:stats:miss"
+
+
+def _version_key(cell):
+    return f"listing:cell:{cell}"
+
+
+def enabled():
+    return settings.LISTING_CACHE_TTL > 0
+
+
+# 위치를 LISTING_CACHE_CELL_DEGREES 칸의 중심 좌표로
+def snap_location(lat, lng):
+    size = settings.LISTING_CACHE_CELL_DEGREES
+    return (lat // size + 0.5) * size, (lng // size + 0.5) * size
+
+
+# 칸 중심과 칸 안 실제 위치 사이 최대 거리보다 큰 여유 반경 (칸 한 개 크기)
+def cell_margin_km():
+    return settings.LISTING_CACHE_CELL_DEGREES * KM_PER_DEGREE
+
+
+def _versions(cells):
+    keys = [_version_key(cell) for cell in cells]
+    found = cache.get_many(keys)
+    return [found.get(key, 0) for key in keys]
+
+
+# 가게가 바뀐 칸의 버전을 올림
+def bump_cells(cells):
+    for cell in set(cells):
+        if cell:
+            incr(_version_key(cell))
+
+
+def cache_key(lat, lng, radius, versions):
+    signature = json.dumps([lat, lng, radius, versions])
+    return "listing:" + hashlib.blake2b(signature.encode(), digest_size=16).hexdigest()
+
+
+# (lat, lng) 에서 radius 이내 오픈한 가게 -> (가게 id 배열, 거리(km) 배열)
+# spatial.nearby_store_distances 와 같은 결과 (칸 단위로 캐시한 가게 목록에서 계산)
+def nearby_stores(lat, lng, radius):
+    if not enabled():
+        return nearby_store_distances(lat, lng, radius)
+
+    center_lat, center_lng = snap_location(lat, lng)
+    search_radius = radius + cell_margin_km()
+    cells = cells_covering(center_lat, center_lng, search_radius)
+    if cells is None:
+        return nearby_store_distances(lat, lng, radius)
+
+    key = cache_key(center_lat, center_lng, search_radius, _versions(cells))
+    candidates = cache.get(key)
+    if candidates is not None:
+        incr(HIT_KEY)
+    else:
+        incr(MISS_KEY)
+        ids, coords = nearby_store_candidates(center_lat, center_lng, search_radius)
+        candidates = (list(ids), [tuple(coord) for coord in coords])
+        cache.set(key, candidates, timeout=settings.LISTING_CACHE_TTL)
+    return filter_radius(lat, lng, radius, *candidates)
+
+
+def cache_stats():
+    hits = cache.get(HIT_KEY, 0)
+    misses = cache.get(MISS_KEY, 0)
+    total = hits + misses
+    return {"hits": hits, "misses": misses, "hit_rate": hits / total if total else 0.0}
@@ -0,0 +1,94 @@
+from django.conf import settings
+from django.utils import timezone
+
+from products.models import Product
+
+# ------------------------------------------------
+# 상품 목록 빠른 직렬화 (근처 / 특가 / 위시리스트)
+#
+# ProductReadSerializer 와 같은 응답을 .values() 로 읽은 행에서 바로 만든다.
+#   - 필요한 컬럼만 조회 (모델 인스턴스 / 가게 / 카테고리 객체를 만들지 않음)
+#   - DRF 필드별 to_representation 호출 없이 dict 한 번에 생성
+# 응답 필드나 형식을 바꿀 때는 ProductReadSerializer 와 같이 바꾸고
+# products.tests 로 두 결과가 같은지 확인한다 (속도 비교는 `manage.py benchmark_product_rows`).
+
+# values() 컬럼 (ProductReadSerializer 필드 순서)
+COLUMNS = (
+    "id", "store_id", "store__latitude", "store__longitude", "store__store_name",
+    "category_id", "category__name",
+    "image", "name", "description",
+    "price", "discount_price", "discount_rate",
+    "stock", "expiration_date", "is_active",
+    "created_at", "updated_at",
+)
+# annotate 되어 있을 때만 응답에 들어가는 필드
+OPTIONAL_COLUMNS = ("distance_km",)
+
+
+# queryset -> 직렬화에 필요한 컬럼만 읽는 values() queryset
+def product_values(queryset):
+    annotations = queryset.query.annotations
+    return queryset.values(*COLUMNS, *(name for name in OPTIONAL_COLUMNS if name in annotations))
+
+
+# DRF DateTimeField 와 같은 형식 (현재 타임존 ISO 8601, UTC 는 Z)
+def _datetime(value, tz):
+    if not value:
+        return None
+    if tz is not None:
+        value = value.astimezone(tz) if timezone.is_aware(value) else timezone.make_aware(value, tz)
+    text = value.isoformat()
+    if text.endswith("+00:00"):
+        text = text[:-6] + "Z"
+    return text
+
+
+def _optional(value, cast):
+    return None if value is None else cast(value)
+
+
+# values() 행 목록 -> ProductReadSerializer(..., many=True).data 와 같은 dict 목록
+def serialize_product_rows(rows, request=None):
+    tz = timezone.get_current_timezone() if settings.USE_TZ else None
+    storage = Product._meta.get_field("image").storage
+    image_urls = {}
+
+    def image_url(name):
+        if not name:
+            return None
+        url = image_urls.get(name)
+        if url is None:
+            url = storage.url(name)
+            if request is not None:
+                url = request.build_absolute_uri(url)
+            image_urls[name] = url
+        return url
+
+    results = []
+    for row in rows:
+        data = {
+            "id": row["id"],
+            "store": {
+                "id": row["store_id"],
+                "lat": row["store__latitude"],
+                "lng": row["store__longitude"],
+            },
+            "store_name": _optional(row["store__store_name"], str),
+            "category": row["category_id"],
+            "category_name": _optional(row["category__name"], str),
+            "image": image_url(row["image"]),
+            "name": str(row["name"]),
+            "description": str(row["description"]),
+            "price": int(row["price"]),
+            "discount_price": int(row["discount_price"]),
+            "discount_rate": _optional(row["discount_rate"], int),
+            "stock": int(row["stock"]),
+            "expiration_date": _datetime(row["expiration_date"], tz),
+            "is_active": bool(row["is_active"]),
+            "created_at": _datetime(row["created_at"], tz),
+            "updated_at": _datetime(row["updated_at"], tz),
+        }
+        if "distance_km" in row:
+            data["distance_km"] = _optional(row["distance_km"], float)
+        results.append(data)
+    return results
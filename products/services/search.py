@@ -0,0 +1,114 @@
+from django.db import connection
+from django.db.models import Q
+from django.db.models.expressions import RawSQL
+
+# ------------------------------------------------
+# 상품 검색 인덱스 (SQLite FTS5, trigram 토크나이저)
+#
+# 상품명 / 설명 / 가게명 / 카테고리명을 product_search 가상 테이블에 모아 두고
+# rowid = 상품 id 로 MATCH 한 결과를 `id IN (...)` 서브쿼리로 붙인다.
+# -> 근처 가게 필터와 DB 안에서 교집합, LIKE '%...%' 전체 스캔 없음
+# trigram 은 띄어쓰기 없는 한글도 부분 문자열로 찾을 수 있지만 3글자 이상만 인덱스를 탐.
+# 3글자 미만 검색어와 SQLite 가 아닌 DB 는 icontains 로 처리한다.
+# 동기화는 products.signals (상품 / 가게 / 카테고리 저장, 삭제) 가 담당
+
+TABLE = "product_search"
+
+# 테이블 생성 : products/migrations/0006_product_search_index.py
+CREATE_TABLE = (
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {TABLE} "
+    "USING fts5(name, description, store_name, category_name, tokenize='trigram')"
+)
+
+SOURCE = (
+    "SELECT p.id, p.name, p.description, s.store_name, c.name "
+    "FROM products_product p "
+    "JOIN stores_store s ON s.id = p.store_id "
+    "JOIN categories_category c ON c.id = p.category_id"
+)
+
+MIN_TERM_LENGTH = 3
+
+# 한 번에 다시 색인할 상품 수 (SQLite 변수 개수 제한)
+INDEX_BATCH = 500
+
+
+def fts_enabled():
+    return connection.vendor == "sqlite"
+
+
+def _index(product_ids):
+    with connection.cursor() as cursor:
+        for start in range(0, len(product_ids), INDEX_BATCH):
+            ids = product_ids[start:start + INDEX_BATCH]
+            marks = ",".join(["%s"] * len(ids))
+            cursor.execute(f"DELETE FROM {TABLE} WHERE rowid IN ({marks})", ids)
+            cursor.execute(
+                f"INSERT INTO {TABLE} (rowid, name, description, store_name, category_name) "
+                f"{SOURCE} WHERE p.id IN ({marks})",
+                ids,
+            )
+
+
+# 상품 저장 / 가게명, 카테고리명 변경 시
+def index_products(product_ids):
+    product_ids = list(product_ids)
+    if fts_enabled() and product_ids:
+        _index(product_ids)
+
+
+def remove_products(product_ids):
+    product_ids = list(product_ids)
+    if not fts_enabled() or not product_ids:
+        return
+    with connection.cursor() as cursor:
+        for start in range(0, len(product_ids), INDEX_BATCH):
+            ids = product_ids[start:start + INDEX_BATCH]
+            marks = ",".join(["%s"] * len(ids))
+            cursor.execute(f"DELETE FROM {TABLE} WHERE rowid IN ({marks})", ids)
+
+
+# 전체 재색인 -> 색인한 상품 수
+def rebuild_search_index():
+    if not fts_enabled():
+        return 0
+    with connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {TABLE}")
+        cursor.execute(f"INSERT INTO {TABLE} (rowid, name, description, store_name, category_name) {SOURCE}")
+        cursor.execute(f"SELECT count(*) FROM {TABLE}")
+        return cursor.fetchone()[0]
+
+
+# FTS5 MATCH 식 (각 단어를 구문으로 감싸 특수문자 무력화, 모두 포함)
+def match_expression(terms):
+    return " AND ".join('"' + term.replace('"', '""') + '"' for term in terms)
+
+
+def _icontains(term):
+    return (
+        Q(name__icontains=term)
+        | Q(description__icontains=term)
+        | Q(store__store_name__icontains=term)
+        | Q(category__name__icontains=term)
+    )
+
+
+# 검색어의 모든 단어를 포함하는 상품으로 거름
+def filter_products(queryset, search):
+    terms = search.split()
+    if not fts_enabled():
+        for term in terms:
+            queryset = queryset.filter(_icontains(term))
+        return queryset
+
+    indexed = [term for term in terms if len(term) >= MIN_TERM_LENGTH]
+    if indexed:
+        queryset = queryset.filter(id__in=RawSQL(
+            f"SELECT rowid FROM {TABLE} WHERE {TABLE} MATCH %s",
+            [match_expression(indexed)],
+        ))
+    # 짧은 단어는 (이미 줄어든 후보에서) 부분 일치
+    for term in terms:
+        if len(term) < MIN_TERM_LENGTH:
+            queryset = queryset.filter(_icontains(term))
+    return queryset
@@ -1,6 +1,10 @@
-from django.db.models.signals import post_save
+from django.db.models.signals import pre_save, post_save, post_delete
 from django.dispatch import receiver
+from categories.models import Category
+from stores.models import Store
 from .models import Product, Wishlist
+from .services.search import index_products, remove_products
+from .services.listing_cache import bump_cells
 
 import logging
 logger = logging.getLogger(__name__)
@@ -10,3 +14,59 @@ logger = logging.getLogger(__name__)
 def remove_wishlist_if_inactive(sender, instance, **kwargs):
     if not instance.is_active:
         Wishlist.objects.filter(product=instance).delete()
+
+# 상품 검색 인덱스 동기화 (상품명 / 설명 / 가게명 / 카테고리명)
+# 재고 / 판매 상태처럼 색인과 상관없는 저장은 건너뛰도록 저장 전 값과 비교
+SEARCH_FIELDS = ("name", "description", "category_id", "store_id")
+
+@receiver(pre_save, sender=Product)
+def remember_search_fields(sender, instance, update_fields=None, **kwargs):
+    instance._search_changed = True
+    if not instance.pk:
+        return
+    if update_fields is not None:
+        instance._search_changed = bool(
+            {"name", "description", "category", "category_id", "store", "store_id"} & set(update_fields)
+        )
+        return
+    previous = Product.objects.filter(pk=instance.pk).values_list(*SEARCH_FIELDS).first()
+    instance._search_changed = previous != tuple(getattr(instance, field) for field in SEARCH_FIELDS)
+
+@receiver(post_save, sender=Product)
+def sync_product_search(sender, instance, created, **kwargs):
+    if created or getattr(instance, "_search_changed", True):
+        index_products([instance.id])
+
+@receiver(post_delete, sender=Product)
+def remove_product_search(sender, instance, **kwargs):
+    remove_products([instance.id])
+
+# 오픈 토글처럼 이름과 상관없는 저장은 건너뜀
+@receiver(post_save, sender=Store)
+def sync_store_products_search(sender, instance, created, update_fields=None, **kwargs):
+    if created or (update_fields is not None and "store_name" not in update_fields):
+        return
+    index_products(instance.products.values_list("id", flat=True))
+
+@receiver(post_save, sender=Category)
+def sync_category_products_search(sender, instance, created, **kwargs):
+    if not created:
+        index_products(Product.objects.filter(category=instance).values_list("id", flat=True))
+
+# 근처 / 특가 목록의 가게 캐시 무효화 (바뀐 가게가 있는 격자 칸의 버전을 올림)
+# 좌표가 바뀌면 예전 칸의 목록도 무효화해야 하므로 저장 전 칸을 기억
+@receiver(pre_save, sender=Store)
+def remember_store_cell(sender, instance, update_fields=None, **kwargs):
+    instance._previous_geo_cell = None
+    if instance.pk and (update_fields is None or {"latitude", "longitude"} & set(update_fields)):
+        instance._previous_geo_cell = (
+            Store.objects.filter(pk=instance.pk).values_list("geo_cell", flat=True).first()
+        )
+
+@receiver(post_save, sender=Store)
+def invalidate_store_listing(sender, instance, **kwargs):
+    bump_cells([instance.geo_cell, getattr(instance, "_previous_geo_cell", None)])
+
+@receiver(post_delete, sender=Store)
+def invalidate_deleted_store_listing(sender, instance, **kwargs):
+    bump_cells([instance.geo_cell])
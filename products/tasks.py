@@ -2,8 +2,8 @@ from celery import shared_task
 from django.utils import timezone
 from .models import Product
 
-from accounts.services.reco import ITEM_VECS, ITEM_IDS, IDX, load_item_vectors, load_item_ids
 from .management.commands.build_embeddings import build_all_embeddings
+from accounts.tasks import rebuild_user_tastes
 
 
 @shared_task
@@ -11,17 +11,18 @@ def deactivate_expired_products():
     now = timezone.now()
     expired_qs = Product.objects.filter(expiration_date__lt=now, is_active=True)
 
-    count = expired_qs.update(is_active=False)
+    # update() 는 auto_now 를 갱신하지 않으므로 updated_at 을 직접 기록 (추천 특성 테이블 동기화용)
+    count = expired_qs.update(is_active=False, updated_at=now)
 
     return f"{count}개의 유통기한 지난 상품이 비활성화되었습니다."
 
 
 @shared_task
 def daily_embedding_refresh():
-    global ITEM_VECS, ITEM_IDS, IDX
-    build_all_embeddings()
+    # 웹 워커는 manifest 변경을 감지해 새 스냅샷으로 교체한다
+    version = build_all_embeddings()
 
-    ITEM_VECS = load_item_vectors()  
-    ITEM_IDS  = load_item_ids()
-
-    IDX = {int(pid): i for i, pid in enumerate(ITEM_IDS)}
\ No newline at end of file
+    # 새 스냅샷이면 유저 취향 벡터도 다시 계산
+    if version is not None:
+        rebuild_user_tastes.delay()
+    return version
\ No newline at end of file
@@ -0,0 +1,238 @@
+import io
+import shutil
+import tempfile
+from contextlib import redirect_stdout
+from datetime import timedelta
+from unittest import mock
+
+import httpx
+import numpy as np
+import openai
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+
+from accounts.services.embedding_store import open_snapshot
+from project.query_budget import record_queries
+from project.testing import QueryBudgetTestCase, make_category, make_store, make_store_with_products, make_user
+from stores.utils import spatial
+from stores.utils.spatial import annotate_distance
+
+from .management.commands.build_embeddings import build_all_embeddings
+from .models import Product, Wishlist
+from .serializers import ProductReadSerializer
+from .services import autocomplete
+from .services.autocomplete import MAX_SCAN, PRODUCT, PrefixIndex
+from .services.embedder import OpenAIEmbedder
+from .services.product_rows import product_values, serialize_product_rows
+from .services.search import TABLE, filter_products
+
+
+# 빠른 직렬화(services.product_rows)가 ProductReadSerializer 와 같은 JSON 을 내는지
+class ProductRowsParityTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        category = make_category()
+        now = timezone.now()
+        cls.stores = [make_store(latitude=37.5 + i * 0.01, longitude=127.0 + i * 0.01) for i in range(3)]
+        Product.objects.bulk_create(
+            Product(
+                store=cls.stores[i % 3], category=category, name=f"상품 {i}",
+                # 빈 설명 / 빈 이미지 / 공백이 있는 파일명 / 할인율 없음 / 비활성 같은 경계값
+                description="" if i % 4 == 0 else "설명 " * i,
+                image="" if i % 5 == 0 else f"products/parity {i}.jpg",
+                price=1000 + i, discount_price=500, discount_rate=None if i % 3 == 0 else i,
+                stock=i % 4, expiration_date=now + timedelta(hours=i + 1, microseconds=i), is_active=i % 6 != 0,
+            )
+            for i in range(30)
+        )
+
+    def assertSameJSON(self, queryset, request):
+        renderer = JSONRenderer()
+        expected = ProductReadSerializer(
+            queryset.select_related("store", "category"), many=True, context={"request": request},
+        ).data
+        actual = serialize_product_rows(product_values(queryset), request)
+        self.assertEqual(renderer.render(actual), renderer.render(expected))
+
+    def test_plain_listing(self):
+        queryset = Product.objects.order_by("-id")
+        self.assertSameJSON(queryset, RequestFactory().get("/products/wishlist/"))
+        self.assertSameJSON(queryset, None)
+
+    def test_distance_listing(self):
+        # 마지막 가게는 거리 없음 (None)
+        store_ids = [store.id for store in self.stores[:2]]
+        queryset = annotate_distance(Product.objects.order_by("-id"), store_ids, [0.1234, 2.5])
+        self.assertSameJSON(queryset, RequestFactory().get("/products/nearby/"))
+        self.assertSameJSON(queryset, None)
+
+
+# 반경 파라미터는 LISTING_MAX_RADIUS_KM 까지만 (가게 수만큼 커지는 IN / CASE 제한)
+@override_settings(LISTING_MAX_RADIUS_KM=20.0, STORE_NEARBY_SEARCH="db")
+class ListingRadiusTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        # 서울 (가까운 가게) / 부산 (약 325km)
+        cls.near = make_store_with_products(discount_rate=50)[1][0]
+        make_store_with_products(store_fields={"latitude": 35.1, "longitude": 129.0}, discount_rate=50)
+        cls.consumer = make_user()
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.consumer)
+
+    def test_large_radius_is_clamped(self):
+        for url in ("/products/nearby/", "/products/discount/"):
+            with self.subTest(url):
+                response = self.client.get(url, {"lat": 37.5, "lng": 127.0, "radius": 1e9})
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual([item["id"] for item in response.data["results"]], [self.near.id])
+
+    def test_invalid_radius(self):
+        response = self.client.get("/products/nearby/", {"lat": 37.5, "lng": 127.0, "radius": "nan"})
+        self.assertEqual(response.status_code, 400)
+
+
+# 짧은 접두사도 범위 전체에서 인기도 순으로 고르는지 (앞쪽 MAX_SCAN 개 키만 보지 않음)
+class AutocompleteRankingTests(SimpleTestCase):
+    def test_short_prefix_ranks_whole_range(self):
+        index = PrefixIndex()
+        items = [(PRODUCT, i, f"가a{i:05d}", 0, True) for i in range(MAX_SCAN + 500)]
+        # 키 순서로는 맨 뒤 (ㄱㅏz > ㄱㅏa...)
+        items.append((PRODUCT, 99999, "가z 우유", 100, True))
+        index.load(items)
+        for query in ("ㄱ", "가", "가z"):
+            with self.subTest(query):
+                self.assertEqual(index.search(query, limit=3)[0]["id"], 99999)
+
+
+# 상품 API 가 뷰셋 query_budgets 안에서 끝나는지 (워커 인덱스 변경분 갱신이 겹치는 요청 기준)
+class ProductQueryBudgetTests(QueryBudgetTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.consumer = make_user()
+        for i in range(5):
+            _, products = make_store_with_products(5, {"latitude": 37.5 + i * 0.001}, discount_rate=50)
+            Wishlist.objects.create(consumer=cls.consumer, product=products[0])
+        cls.product = products[0]
+
+    def setUp(self):
+        self.client = self.budget_client(self.consumer)
+        # 인덱스는 만들어 둔 상태에서 변경분 갱신 주기가 된 요청으로 측정
+        for index, build in ((spatial._GRID, spatial.get_store_index), (autocomplete._INDEX, autocomplete.get_autocomplete_index)):
+            build()
+            index.checked_at = 0.0
+
+    def test_listing_endpoints(self):
+        location = {"lat": 37.5, "lng": 127.0, "radius": 3}
+        for url, params in (
+            ("/products/", {}),
+            (f"/products/{self.product.id}/", {}),
+            ("/products/nearby/", {**location, "sort": "distance"}),
+            ("/products/nearby/", {**location, "search": "가게"}),
+            ("/products/discount/", location),
+            ("/products/autocomplete/", {"q": "가"}),
+            ("/products/wishlist/", {}),
+        ):
+            with self.subTest(url, **params):
+                self.assertWithinBudget(self.client.get(url, params))
+
+
+# 상품 검색 인덱스는 이름 / 설명 / 카테고리 / 가게가 바뀐 저장에서만 다시 색인
+class ProductSearchSyncTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.product = make_store_with_products(stock=5)[1][0]
+
+    def assertReindexed(self, expected, save):
+        with record_queries() as log:
+            save()
+        self.assertEqual(any(TABLE in shape for shape in log.shapes), expected)
+
+    def test_stock_only_saves_skip_reindex(self):
+        product = Product.objects.get(pk=self.product.pk)
+        product.stock -= 1
+        self.assertReindexed(False, product.save)
+        product.is_active = False
+        self.assertReindexed(False, lambda: product.save(update_fields=["stock", "is_active", "updated_at"]))
+
+    def test_rename_reindexes(self):
+        product = Product.objects.get(pk=self.product.pk)
+        product.name = "딸기 우유 식빵"
+        self.assertReindexed(True, product.save)
+        self.assertEqual(list(filter_products(Product.objects.all(), "딸기 우유")), [product])
+
+
+class FakeEmbedder:
+    model = "test"
+
+    def embed(self, texts):
+        return [np.ones(4, dtype="float32") for _ in texts]
+
+
+# 활성 상품이 모두 사라지면 이전 스냅샷 대신 빈 스냅샷이 게시되는지
+@override_settings(RECO_ANN_INDEX=False, EMBEDDING_QUANTIZATION="", EMBEDDING_PCA_COMPONENTS=0)
+class BuildEmbeddingsTests(TestCase):
+    def setUp(self):
+        self.base_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.base_dir)
+        self.enterContext(self.settings(EMBEDDINGS_DIR=self.base_dir))
+
+    def build(self):
+        with redirect_stdout(io.StringIO()):
+            return build_all_embeddings(embedder=FakeEmbedder())
+
+    def test_no_active_products_publishes_empty_snapshot(self):
+        product = make_store_with_products(stock=5)[1][0]
+        self.build()
+        self.assertEqual(len(open_snapshot(self.base_dir)[1]), 1)
+
+        Product.objects.filter(pk=product.pk).update(is_active=False)
+        self.assertIsNotNone(self.build())
+        manifest, store, _ = open_snapshot(self.base_dir)
+        self.assertEqual(manifest["count"], 0)
+        self.assertNotIn(product.id, store)
+        # 이미 비어 있으면 다시 게시하지 않음
+        self.assertIsNone(self.build())
+
+
+class FakeEmbeddingsClient:
+    def __init__(self, *errors):
+        self.errors = list(errors)
+        self.calls = 0
+        self.embeddings = self
+
+    def create(self, model, input):
+        self.calls += 1
+        if self.errors:
+            raise self.errors.pop(0)
+        return mock.Mock(data=[mock.Mock(index=i, embedding=[1.0]) for i in range(len(input))])
+
+
+def api_error(cls, status):
+    request = httpx.Request("POST", "https://api.openai.com/v1/embeddings")
+    return cls("error", response=httpx.Response(status, request=request), body=None)
+
+
+# 일시적 오류만 재시도하고 나머지는 바로 실패하는지
+class OpenAIEmbedderRetryTests(SimpleTestCase):
+    def embed(self, client):
+        return OpenAIEmbedder(client=client, max_retries=3, backoff=0.0).embed(["a", "b"])
+
+    def test_transient_errors_are_retried(self):
+        request = httpx.Request("POST", "https://api.openai.com/v1/embeddings")
+        client = FakeEmbeddingsClient(
+            api_error(openai.RateLimitError, 429),
+            api_error(openai.InternalServerError, 503),
+            openai.APITimeoutError(request=request),
+        )
+        self.assertEqual(self.embed(client), [[1.0], [1.0]])
+        self.assertEqual(client.calls, 4)
+
+    def test_other_errors_fail_immediately(self):
+        client = FakeEmbeddingsClient(api_error(openai.BadRequestError, 400))
+        with self.assertLogs("products.services.embedder", "ERROR"):
+            self.assertEqual(self.embed(client), [None, None])
+        self.assertEqual(client.calls, 1)
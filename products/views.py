@@ -1,37 +1,51 @@
+import math
+
 from rest_framework import viewsets, status
 from rest_framework.permissions import IsAuthenticated, AllowAny
 from rest_framework.parsers import JSONParser, FormParser, MultiPartParser
 from rest_framework.response import Response
 from rest_framework.decorators import action
 from rest_framework.exceptions import ValidationError
+from django.conf import settings
 from django.shortcuts import get_object_or_404
-from django.db.models import Q
-from math import radians, cos, sin, asin, sqrt
 
 from accounts.permissions import IsSeller, IsConsumer
+from project.pagination import KeysetPagination
+from project.db_router import ReplicaReadMixin
+from accounts.services.reco_cache import invalidate_user
+from accounts.services.taste import update_user_taste
+from accounts.services.batch_reco import invalidate_precomputed
 from stores.models import Store
+from stores.utils.spatial import annotate_distance
 from .models import Product, Wishlist
+from .services.search import filter_products
+from .services.autocomplete import suggest
+from .services import listing_cache
+from .services.product_rows import product_values, serialize_product_rows
 from .serializers import ProductReadSerializer, ProductCreateUpdateSerializer
 
-
-# 두 좌표 사이 거리 계산
-def haversine(lon1, lat1, lon2, lat2):
-    lon1, lat1, lon2, lat2 = map(radians, [lon1, lat1, lon2, lat2])
-    dlon = lon2 - lon1
-    dlat = lat2 - lat1
-    a = sin(dlat/2)**2 + cos(lat1) * cos(lat2) * sin(dlon/2)**2
-    c = 2 * asin(sqrt(a))
-    km = 6371 * c
-    return km
-
-
-class ProductViewSet(viewsets.ModelViewSet):
+# 반경 파라미터 -> km (반경 안 가게 수만큼 IN 목록 / 거리 CASE 가 커지므로 LISTING_MAX_RADIUS_KM 까지로 제한)
+def listing_radius(value):
+    radius = float(value)
+    if math.isnan(radius):
+        raise ValueError("radius")
+    return min(max(radius, 0.0), settings.LISTING_MAX_RADIUS_KM)
+
+
+class ProductViewSet(ReplicaReadMixin, viewsets.ModelViewSet):
+    replica_actions = ("list", "retrieve", "all_products", "discounted_products")
+    # 요청당 최대 SQL 쿼리 수 (인증 + 인덱스 갱신 포함, project.query_budget)
+    query_budgets = {
+        "list": 4, "retrieve": 4, "all_products": 6, "discounted_products": 6, "my_wishlist": 4,
+        # 자동완성 인덱스 변경분 갱신 (상품 / 찜 수 / 예약 수 / 가게 / 가게 예약 수) 이 겹치는 요청
+        "autocomplete": 6,
+    }
     queryset = Product.objects.all()
     serializer_class = ProductReadSerializer
     parser_classes = [JSONParser, FormParser, MultiPartParser]
 
     def get_permissions(self):
-        if self.action in ["list", "retrieve", "all_products", "toggle_wishlist", "my_wishlist", "discounted_products"]:
+        if self.action in ["list", "retrieve", "all_products", "toggle_wishlist", "my_wishlist", "discounted_products", "autocomplete"]:
             permission_classes = [IsAuthenticated] 
         else:
             permission_classes = [IsAuthenticated, IsSeller] 
@@ -94,7 +108,7 @@ class ProductViewSet(viewsets.ModelViewSet):
         try:
             lat = float(lat) if lat is not None else None
             lng = float(lng) if lng is not None else None
-            radius = float(radius)
+            radius = listing_radius(radius)
         except (TypeError, ValueError):
             return Response(
                 {"error": "lat, lng, radius 파라미터를 올바르게 입력해주세요."},
@@ -103,43 +117,34 @@ class ProductViewSet(viewsets.ModelViewSet):
 
         search = request.query_params.get("search", "").strip()  
         category_id = request.query_params.get("category")
-        
-        # 오픈 상태인 가게만 
-        stores = Store.objects.filter(is_open=True)
-
-        # 기본: 모든 가게
-        nearby_store_ids = stores.values_list("id", flat = True)
-
-        # 거리 기반 가게 리스트업
-        if lat is not None and lng is not None:
-            nearby_store_ids = []
-            for store in stores:
-                if store.latitude and store.longitude:
-                    dist = haversine(lng, lat, store.longitude, store.latitude)
-                    if dist <= radius:
-                        nearby_store_ids.append(store.id)
-            if nearby_store_ids:
-                stores = stores.filter(id__in=nearby_store_ids)
+        sort = request.query_params.get("sort")
+
+        has_location = lat is not None and lng is not None
+        if sort == "distance" and not has_location:
+            return Response(
+                {"error": "거리순 정렬은 lat, lng 파라미터가 필요합니다."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
 
         queryset = (
             Product.objects
             .select_related("store", "category")
-            .filter(is_active=True, store__in=nearby_store_ids)
+            .filter(is_active=True, store__is_open=True)
         )
 
-        # 검색어: 상품명 + 가게명 기반 검색
+        # 거리 기반 가게 리스트업 (위치 칸별 캐시 + 공간 인덱스 반경 질의, 가게별 거리도 같이 계산)
+        if has_location:
+            store_ids, distances = listing_cache.nearby_stores(lat, lng, radius)
+            queryset = annotate_distance(queryset.filter(store__in=store_ids.tolist()), store_ids, distances)
+
+        # 검색어: 상품명 / 설명 / 가게명 / 카테고리명 검색 인덱스 (근처 가게 필터와 DB 에서 교집합)
         if search:
-            queryset = queryset.filter(
-                Q(name__icontains=search) | Q(store__name__icontains=search)
-            )
-            
+            queryset = filter_products(queryset, search)
+
         if category_id:
             queryset = queryset.filter(category_id = category_id)
 
-        queryset = queryset.order_by("-id")
-
-        serializer = ProductReadSerializer(queryset, many=True, context={"request": request})
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        return self._paginated_products(request, queryset, sort)
 
     # 특가 상품(30% 이상)만 조회
     @action(
@@ -152,35 +157,58 @@ class ProductViewSet(viewsets.ModelViewSet):
         try:
             lat = float(request.query_params.get("lat"))
             lng = float(request.query_params.get("lng"))
-            radius = float(request.query_params.get("radius", 5)) 
+            radius = listing_radius(request.query_params.get("radius", 5))
         except (TypeError, ValueError):
             return Response(
                 {"error": "lat, lng, radius 파라미터를 올바르게 입력해주세요."},
                 status=status.HTTP_400_BAD_REQUEST
             )
 
-        stores = Store.objects.filter(is_open=True)
-
-        nearby_store_ids = []
-        for store in stores:
-            if store.latitude and store.longitude:
-                dist = haversine(lng, lat, store.longitude, store.latitude)
-                if dist <= radius:
-                    nearby_store_ids.append(store.id)
+        store_ids, distances = listing_cache.nearby_stores(lat, lng, radius)
 
         queryset = (
             Product.objects
             .select_related("store", "category")
             .filter(
                 is_active=True,
-                store__id__in=nearby_store_ids,
+                store__id__in=store_ids.tolist(),
                 discount_rate__gte=30
             )
-            .order_by("-id")
         )
+        queryset = annotate_distance(queryset, store_ids, distances)
+
+        return self._paginated_products(request, queryset, request.query_params.get("sort"))
 
-        serializer = ProductReadSerializer(queryset, many=True, context={"request": request})
-        return Response(serializer.data, status=status.HTTP_200_OK)
+    # 근처 / 특가 목록 커서 페이지네이션
+    # 거리순 정렬도 DB 에서 (distance, id) 키셋으로 (파이썬에서 전체 목록을 정렬하지 않음)
+    # 응답은 values() 행에서 바로 생성 (ProductReadSerializer 와 같은 형식, services.product_rows)
+    def _paginated_products(self, request, queryset, sort):
+        ordering = ("distance_km", "-id") if sort == "distance" else ("-id",)
+        paginator = KeysetPagination(ordering)
+        page = paginator.paginate_queryset(product_values(queryset), request, view=self)
+        return paginator.get_paginated_response(serialize_product_rows(page, request))
+
+    # 상품명 / 가게명 자동완성 (입력할 때마다 호출, 근처 목록 조회 없이 메모리 인덱스만 사용)
+    @action(
+        detail=False,
+        methods=["get"],
+        url_path="autocomplete",
+        permission_classes=[IsAuthenticated],
+    )
+    def autocomplete(self, request):
+        query = request.query_params.get("q", "").strip()
+        kind = request.query_params.get("type")
+        if kind not in (None, "product", "store"):
+            return Response(
+                {"error": "type 은 product 또는 store 만 가능합니다."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        try:
+            limit = min(max(int(request.query_params.get("limit", 10)), 1), 50)
+        except ValueError:
+            return Response({"error": "limit 파라미터를 올바르게 입력해주세요."}, status=status.HTTP_400_BAD_REQUEST)
+
+        return Response({"results": suggest(query, limit=limit, kind=kind)}, status=status.HTTP_200_OK)
 
     #찜 추가/삭제
     @action(
@@ -206,6 +234,11 @@ class ProductViewSet(viewsets.ModelViewSet):
         else:
             wishlisted = True
 
+        # 찜 목록이 바뀌었으므로 취향 벡터 갱신 + 추천 캐시 / 미리 계산된 후보 무효화
+        update_user_taste(request.user)
+        invalidate_user(request.user)
+        invalidate_precomputed(request.user)
+
         return Response(
             {"product_id": product.id, "wishlisted": wishlisted},
             status=status.HTTP_200_OK
@@ -227,11 +260,9 @@ class ProductViewSet(viewsets.ModelViewSet):
             .order_by("-id")
         )
 
-        page = self.paginate_queryset(product_qs)
+        page = self.paginate_queryset(product_values(product_qs))
         if page is not None:
-            serializer = ProductReadSerializer(page, many=True, context={"request": request})
-            return self.get_paginated_response(serializer.data)
+            return self.get_paginated_response(serialize_product_rows(page, request))
 
-        serializer = ProductReadSerializer(product_qs, many=True, context={"request": request})
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        return Response(serialize_product_rows(product_values(product_qs), request), status=status.HTTP_200_OK)
 
@@ -0,0 +1,14 @@
+from django.core.cache import cache
+
+# ------------------------------------------------
+# 캐시 카운터 (적중률 통계 / 세대·버전 번호)
+# 키가 없으면 0 으로 만든 뒤 올린다. add 는 이미 있으면 덮어쓰지 않으므로
+# 여러 워커가 동시에 처음 올려도 값이 사라지지 않는다.
+
+
+def incr(key, delta=1):
+    try:
+        return cache.incr(key, delta)
+    except ValueError:
+        cache.add(key, 0, timeout=None)
+        return cache.incr(key, delta)
@@ -0,0 +1,92 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache import cache
+
+# ------------------------------------------------
+# 읽기 / 쓰기 DB 라우팅
+#
+# 쓰기는 항상 primary(default). 읽기는 읽기 전용 구간(use_replica / ReplicaReadMixin)
+# 안에서만 replica 로 보낸다. replica 설정이 없으면 모두 default.
+# read-your-writes :
+#   - 한 요청 안에서 쓰기가 일어나면 그 뒤 읽기는 primary 로
+#   - 쓰기를 한 유저는 DB_REPLICA_PIN_SECONDS 동안 primary 에서 읽음 (복제 지연 동안 내 변경이 안 보이는 문제)
+
+REPLICA = "replica"
+PRIMARY = "default"
+
+_use_replica = ContextVar("use_replica", default=False)
+_sticky = ContextVar("replica_sticky", default=True)
+_wrote = ContextVar("db_wrote", default=False)
+
+
+def replica_enabled():
+    return REPLICA in settings.DATABASES
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        if not _use_replica.get() or not replica_enabled():
+            return None
+        if _sticky.get() and _wrote.get():
+            return PRIMARY
+        return REPLICA
+
+    def db_for_write(self, model, **hints):
+        _wrote.set(True)
+        return PRIMARY
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
+
+    # replica 는 복제로만 채움
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == PRIMARY
+
+
+# 읽기 위주 작업 구간 (sticky=False 면 구간 안에서 쓰기를 해도 계속 replica 에서 읽음 -> 배치 작업용)
+@contextmanager
+def use_replica(sticky=True):
+    tokens = (_use_replica.set(True), _sticky.set(sticky), _wrote.set(False))
+    try:
+        yield
+    finally:
+        for var, token in zip((_use_replica, _sticky, _wrote), tokens):
+            var.reset(token)
+
+
+def _pin_key(user_id):
+    return f"db:pin:{user_id}"
+
+
+def recently_wrote(user):
+    return bool(user and user.is_authenticated and cache.get(_pin_key(user.id)))
+
+
+# 요청마다 라우팅 상태 초기화 + 쓰기를 한 유저는 잠시 primary 에 고정
+class ReplicaRoutingMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        tokens = (_use_replica.set(False), _sticky.set(True), _wrote.set(False))
+        try:
+            response = self.get_response(request)
+            user = getattr(request, "user", None)
+            if _wrote.get() and replica_enabled() and user is not None and user.is_authenticated:
+                cache.set(_pin_key(user.id), True, timeout=settings.DB_REPLICA_PIN_SECONDS)
+            return response
+        finally:
+            for var, token in zip((_use_replica, _sticky, _wrote), tokens):
+                var.reset(token)
+
+
+# 읽기 전용 action 은 replica 에서 읽음 (인증이 끝난 뒤 유저 기준으로 판단)
+class ReplicaReadMixin:
+    replica_actions = ()
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        if self.action in self.replica_actions and not recently_wrote(request.user):
+            _use_replica.set(True)
@@ -0,0 +1,104 @@
+import base64
+import binascii
+import json
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+# ------------------------------------------------
+# 키셋(커서) 페이지네이션
+#
+# 마지막으로 보낸 행의 정렬 키 값을 커서에 담고, 다음 페이지는
+# `(정렬 키) > (커서 값)` 조건으로 이어서 읽는다. -> OFFSET 없이 항상 인덱스 범위 조회
+# 정렬 키의 마지막 필드는 유일해야 함 (보통 id)
+#
+#   ?page_size=20&cursor=<이전 응답의 next 에 들어있는 값>
+
+
+class KeysetPagination(BasePagination):
+    cursor_query_param = "cursor"
+    page_size_query_param = "page_size"
+    ordering = ("-id",)
+
+    def __init__(self, ordering=None):
+        if ordering is not None:
+            self.ordering = tuple(ordering)
+
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return settings.API_PAGE_SIZE
+        return max(1, min(size, settings.API_MAX_PAGE_SIZE))
+
+    def encode_cursor(self, values):
+        data = json.dumps(values, cls=DjangoJSONEncoder, separators=(",", ":"))
+        return base64.urlsafe_b64encode(data.encode()).decode()
+
+    def decode_cursor(self, request, queryset):
+        raw = request.query_params.get(self.cursor_query_param)
+        if not raw:
+            return None
+        try:
+            values = json.loads(base64.urlsafe_b64decode(raw.encode()).decode())
+        except (binascii.Error, UnicodeDecodeError, ValueError):
+            raise NotFound("잘못된 cursor 입니다.")
+        if not isinstance(values, list) or len(values) != len(self.ordering):
+            raise NotFound("잘못된 cursor 입니다.")
+        try:
+            return [self._cast(field.lstrip("-"), value, queryset) for field, value in zip(self.ordering, values)]
+        except (TypeError, ValueError, ValidationError):
+            raise NotFound("잘못된 cursor 입니다.")
+
+    # 커서 값을 정렬 필드 타입으로
+    def _cast(self, name, value, queryset):
+        if value is None or isinstance(value, (bool, list, dict)):
+            raise ValueError(name)
+        annotation = queryset.query.annotations.get(name)
+        field = annotation.output_field if annotation is not None else queryset.model._meta.get_field(name)
+        return field.to_python(value)
+
+    # 정렬 순서상 values 다음에 오는 행
+    #   (a, b) -> a > va | (a = va & b > vb)   ('-' 필드는 < 로)
+    def _after(self, values):
+        condition, equal = Q(), {}
+        for field, value in zip(self.ordering, values):
+            name = field.lstrip("-")
+            lookup = "lt" if field.startswith("-") else "gt"
+            condition |= Q(**equal, **{f"{name}__{lookup}": value})
+            equal[name] = value
+        return condition
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        size = self.get_page_size(request)
+        queryset = queryset.order_by(*self.ordering)
+
+        cursor = self.decode_cursor(request, queryset)
+        if cursor is not None:
+            queryset = queryset.filter(self._after(cursor))
+
+        # 한 행 더 읽어서 다음 페이지가 있는지 확인
+        rows = list(queryset[:size + 1])
+        self.page = rows[:size]
+        self.has_next = len(rows) > size
+        return self.page
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        last = self.page[-1]
+        # 모델 인스턴스 또는 values() 행
+        get = last.get if isinstance(last, dict) else lambda name: getattr(last, name)
+        values = [get(field.lstrip("-")) for field in self.ordering]
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, self.encode_cursor(values))
+
+    def get_paginated_response(self, data):
+        return Response({"next": self.get_next_link(), "results": data})
@@ -0,0 +1,171 @@
+import json
+import logging
+import re
+import sys
+import time
+from collections import Counter
+from contextlib import ExitStack, contextmanager
+
+from django.conf import settings
+from django.db import connections
+from rest_framework.serializers import Serializer
+
+logger = logging.getLogger("project.queries")
+
+# ------------------------------------------------
+# 요청별 SQL 쿼리 수 / 시간 / 반복되는 쿼리 모양(N+1) 기록
+#
+#   응답 헤더 : X-Query-Count, X-Query-Time-Ms, X-Query-Duplicates (+ 예산이 있으면 X-Query-Budget)
+#   로그     : project.queries 로거에 JSON 한 줄
+# 같은 모양의 쿼리가 DUPLICATE_THRESHOLD 번 이상이면 N+1 로 보고,
+# 두 번째 실행 시점의 호출 위치(시리얼라이저 필드 또는 앱 코드 줄)를 같이 남긴다.
+#
+# 엔드포인트별 예산 : 뷰셋에 query_budgets = {"list": 8, ...} (action 이름 -> 최대 쿼리 수)
+#   초과 시 경고 로그 + X-Query-Budget-Exceeded 헤더, QUERY_BUDGET_STRICT 면 예외
+# 테스트에서는 `with query_budget(5): client.get(...)` 로 직접 검사하거나
+# project.testing.QueryBudgetTestCase 로 뷰셋에 선언한 예산 그대로 요청을 검사
+
+DUPLICATE_THRESHOLD = 3
+
+_IN_LIST = re.compile(r"IN \((?:%s, )*%s\)")
+_SPACES = re.compile(r"\s+")
+
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+
+# 파라미터 값과 IN 목록 길이를 뺀 쿼리 모양
+def query_shape(sql):
+    return _SPACES.sub(" ", _IN_LIST.sub("IN (...)", sql)).strip()
+
+
+# 쿼리를 실행시킨 위치 : 시리얼라이저 필드 > 프로젝트 코드 줄
+def query_source(frame):
+    code_line = None
+    base_dir = str(settings.BASE_DIR)
+    while frame is not None:
+        local = frame.f_locals
+        if frame.f_code.co_name == "to_representation" and isinstance(local.get("self"), Serializer):
+            field = local.get("field")
+            if field is not None:
+                return f"{type(local['self']).__name__}.{field.field_name}"
+        filename = frame.f_code.co_filename
+        if code_line is None and filename.startswith(base_dir) and "site-packages" not in filename \
+                and not filename.endswith("query_budget.py"):
+            code_line = f"{filename[len(base_dir) + 1:]}:{frame.f_lineno}"
+        frame = frame.f_back
+    return code_line
+
+
+class QueryLog:
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+        self.shapes = Counter()
+        self.sources = {}
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.count += 1
+            self.seconds += time.perf_counter() - started
+            shape = query_shape(sql)
+            self.shapes[shape] += 1
+            # 같은 모양이 두 번째 나올 때 위치를 기록 (반복의 원인)
+            if self.shapes[shape] == 2:
+                self.sources[shape] = query_source(sys._getframe(1))
+
+    def duplicates(self, threshold=DUPLICATE_THRESHOLD):
+        return [
+            {"shape": shape, "count": count, "source": self.sources.get(shape)}
+            for shape, count in self.shapes.most_common()
+            if count >= threshold
+        ]
+
+    def summary(self):
+        return {
+            "queries": self.count,
+            "sql_ms": round(self.seconds * 1000, 2),
+            "duplicates": self.duplicates(),
+        }
+
+
+@contextmanager
+def record_queries():
+    log = QueryLog()
+    with ExitStack() as stack:
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(log))
+        yield log
+
+
+def _report(log, limit, label):
+    lines = [f"{label or 'block'} ran {log.count} queries (budget {limit})"]
+    for dup in log.duplicates(threshold=2):
+        lines.append(f"  {dup['count']}x from {dup['source']}: {dup['shape'][:200]}")
+    return "\n".join(lines)
+
+
+# 테스트용 : 블록 안의 쿼리 수가 limit 을 넘으면 실패
+@contextmanager
+def query_budget(limit, label=""):
+    with record_queries() as log:
+        yield log
+    if log.count > limit:
+        raise QueryBudgetExceeded(_report(log, limit, label))
+
+
+def _view_budget(view_func, method):
+    cls = getattr(view_func, "cls", None)
+    budgets = getattr(cls, "query_budgets", None)
+    if not budgets:
+        return None, None
+    action = (getattr(view_func, "actions", None) or {}).get(method.lower())
+    return action, budgets.get(action)
+
+
+class QueryBudgetMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not settings.QUERY_INSTRUMENTATION:
+            return self.get_response(request)
+
+        request._query_budget = (None, None)
+        with record_queries() as log:
+            response = self.get_response(request)
+
+        summary = log.summary()
+        action, limit = request._query_budget
+        response["X-Query-Count"] = str(summary["queries"])
+        response["X-Query-Time-Ms"] = str(summary["sql_ms"])
+        response["X-Query-Duplicates"] = str(len(summary["duplicates"]))
+        if limit is not None:
+            response["X-Query-Budget"] = str(limit)
+
+        record = {
+            "method": request.method,
+            "path": request.path,
+            "status": response.status_code,
+            "action": action,
+            "budget": limit,
+            **summary,
+        }
+        if limit is not None and log.count > limit:
+            response["X-Query-Budget-Exceeded"] = f"{log.count}/{limit}"
+            logger.warning(json.dumps(record, ensure_ascii=False))
+            if settings.QUERY_BUDGET_STRICT:
+                raise QueryBudgetExceeded(_report(log, limit, f"{request.method} {request.path} ({action})"))
+        elif summary["duplicates"]:
+            logger.warning(json.dumps(record, ensure_ascii=False))
+        else:
+            logger.info(json.dumps(record, ensure_ascii=False))
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if settings.QUERY_INSTRUMENTATION:
+            request._query_budget = _view_budget(view_func, request.method)
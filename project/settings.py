@@ -15,6 +15,7 @@ from celery.schedules import crontab
 from pathlib import Path
 
 import os
+import sys
 import environ
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -30,6 +31,53 @@ environ.Env.read_env(os.path.join(BASE_DIR, '.env'))
 # SECURITY WARNING: keep the secret key used in production secret!
 SECRET_KEY = env('SECRET_KEY')
 OPENAI_API_KEY = env("OPENAI_API_KEY")
+# 임베딩 API 주소 (로컬 가짜 서버로 벤치마크할 때 지정)
+OPENAI_BASE_URL = env("OPENAI_BASE_URL", default=None)
+
+# 임베딩 백엔드 : "openai" | "local" (sentence-transformers)
+EMBEDDING_BACKEND = env("EMBEDDING_BACKEND", default="openai")
+EMBEDDING_LOCAL_MODEL = env(
+    "EMBEDDING_LOCAL_MODEL",
+    default="sentence-transformers/paraphrase-multilingual-MiniLM-L12-v2",
+)
+EMBEDDING_LOCAL_BATCH_SIZE = env.int("EMBEDDING_LOCAL_BATCH_SIZE", default=256)
+EMBEDDING_LOCAL_PROCESSES = env.int("EMBEDDING_LOCAL_PROCESSES", default=1)
+
+# 추천 후보 검색 : "exact" (전체 내적) | "ann" (IVF 근사 검색 후 정확히 재채점)
+RECO_SEARCH = env("RECO_SEARCH", default="exact")
+RECO_ANN_INDEX = env.bool("RECO_ANN_INDEX", default=True)
+RECO_ANN_NPROBE = env.int("RECO_ANN_NPROBE", default=8)
+RECO_ANN_CANDIDATES = env.int("RECO_ANN_CANDIDATES", default=200)
+# 후보 특성 테이블에 바뀐 상품 / 가게를 반영하는 주기 (초)
+RECO_FEATURES_REFRESH_SECONDS = env.float("RECO_FEATURES_REFRESH_SECONDS", default=5.0)
+
+# 임베딩 양자화 사본 : "" (사용 안 함) | "float16" | "int8"
+# 사용 시 1차 유사도는 양자화 벡터로 계산하고 상위 RECO_RERANK_CANDIDATES 개만 float32 로 재채점
+EMBEDDING_QUANTIZATION = env("EMBEDDING_QUANTIZATION", default="")
+RECO_RERANK_CANDIDATES = env.int("RECO_RERANK_CANDIDATES", default=200)
+
+# 가게 공간 인덱스 : 격자 칸 크기(도) / 변경 반영 주기(초) / 전체 재생성 주기(초)
+STORE_GRID_CELL_DEGREES = env.float("STORE_GRID_CELL_DEGREES", default=0.05)
+STORE_INDEX_REFRESH_SECONDS = env.float("STORE_INDEX_REFRESH_SECONDS", default=5.0)
+STORE_INDEX_REBUILD_SECONDS = env.float("STORE_INDEX_REBUILD_SECONDS", default=600.0)
+# 상품 / 가게 이름 자동완성 인덱스 : 변경 반영 주기(초) / 전체 재생성 주기(초, 인기도 갱신)
+AUTOCOMPLETE_REFRESH_SECONDS = env.float("AUTOCOMPLETE_REFRESH_SECONDS", default=5.0)
+AUTOCOMPLETE_REBUILD_SECONDS = env.float("AUTOCOMPLETE_REBUILD_SECONDS", default=600.0)
+# 근처 가게 조회 방식 (index: 워커 메모리 격자 인덱스 / db: geo_cell 컬럼 + 위경도 범위 DB 필터)
+STORE_NEARBY_SEARCH = env("STORE_NEARBY_SEARCH", default="index")
+
+# 임베딩 PCA 차원 축소 (0 이면 사용 안 함, 예: 256)
+EMBEDDING_PCA_COMPONENTS = env.int("EMBEDDING_PCA_COMPONENTS", default=0)
+
+# 유저별 추천 캐시 : 유효 시간(초) / limit 대비 저장 개수 배수 / 위치 칸 크기(도)
+RECO_CACHE_TTL = env.int("RECO_CACHE_TTL", default=600)
+RECO_CACHE_DEPTH = env.int("RECO_CACHE_DEPTH", default=3)
+RECO_CACHE_CELL_DEGREES = env.float("RECO_CACHE_CELL_DEGREES", default=0.01)
+
+# 야간 추천 후보 일괄 계산 : 유저당 후보 수 / 점수 행렬 최대 크기(바이트) / 후보 유효 시간(초)
+RECO_PRECOMPUTE_TOP_N = env.int("RECO_PRECOMPUTE_TOP_N", default=100)
+RECO_PRECOMPUTE_MAX_BYTES = env.int("RECO_PRECOMPUTE_MAX_BYTES", default=256 * 1024 * 1024)
+RECO_PRECOMPUTE_MAX_AGE = env.int("RECO_PRECOMPUTE_MAX_AGE", default=36 * 3600)
 GOOGLE_GEOCODING_API_KEY = env("GOOGLE_GEOCODING_API_KEY")
 
 # SECURITY WARNING: don't run with debug turned on in production!
@@ -69,6 +117,21 @@ REST_FRAMEWORK = {
     ),
 }
 
+# 근처 / 특가 목록의 위치 칸별 가게 캐시 : 유효 시간(초, 0 이면 사용 안 함) / 위치 칸 크기(도, 0.005 ≒ 500m)
+LISTING_CACHE_TTL = env.int("LISTING_CACHE_TTL", default=60)
+LISTING_CACHE_CELL_DEGREES = env.float("LISTING_CACHE_CELL_DEGREES", default=0.005)
+# 근처 / 특가 목록 최대 반경(km, 더 큰 값은 이 값으로 줄임)
+LISTING_MAX_RADIUS_KM = env.float("LISTING_MAX_RADIUS_KM", default=20.0)
+
+# 요청별 SQL 쿼리 수 / 시간 / N+1 기록 (응답 헤더 + project.queries 로그)
+QUERY_INSTRUMENTATION = env.bool("QUERY_INSTRUMENTATION", default=DEBUG)
+# 뷰셋 query_budgets 초과 시 예외 (테스트 / 개발용)
+QUERY_BUDGET_STRICT = env.bool("QUERY_BUDGET_STRICT", default=False)
+
+# 목록 API 커서 페이지 크기 (기본 / ?page_size= 최대값)
+API_PAGE_SIZE = env.int("API_PAGE_SIZE", default=20)
+API_MAX_PAGE_SIZE = env.int("API_MAX_PAGE_SIZE", default=100)
+
 SIMPLE_JWT = {
     'BLACKLIST_AFTER_ROTATION': True,
     
@@ -79,6 +142,7 @@ SIMPLE_JWT = {
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'project.query_budget.QueryBudgetMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     
     'corsheaders.middleware.CorsMiddleware',
@@ -86,6 +150,7 @@ MIDDLEWARE = [
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'project.db_router.ReplicaRoutingMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -113,13 +178,67 @@ WSGI_APPLICATION = 'project.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
 
+# SQLite 운영 설정 (연결마다 적용)
+#   WAL : 읽기와 쓰기가 서로 막지 않음 / synchronous=NORMAL : WAL 에서 안전한 수준으로 fsync 줄임
+#   busy_timeout : 잠금이 풀릴 때까지 기다림 / mmap, cache : 읽기 성능
+#   IMMEDIATE 트랜잭션 : 시작할 때 쓰기 잠금을 잡아서 읽기->쓰기 승격 중 "database is locked" 방지
+SQLITE_BUSY_TIMEOUT = env.int("SQLITE_BUSY_TIMEOUT", default=20)    # 초
+SQLITE_MMAP_SIZE = env.int("SQLITE_MMAP_SIZE", default=256 * 1024 * 1024)
+SQLITE_CACHE_SIZE_KB = env.int("SQLITE_CACHE_SIZE_KB", default=64 * 1024)
+SQLITE_PRAGMAS = ";".join([
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    f"PRAGMA busy_timeout={SQLITE_BUSY_TIMEOUT * 1000}",
+    f"PRAGMA mmap_size={SQLITE_MMAP_SIZE}",
+    f"PRAGMA cache_size=-{SQLITE_CACHE_SIZE_KB}",
+    "PRAGMA temp_store=MEMORY",
+])
+
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        # 요청마다 새로 연결하지 않고 재사용 (초)
+        'CONN_MAX_AGE': env.int("DB_CONN_MAX_AGE", default=600),
+        'CONN_HEALTH_CHECKS': True,
+        'OPTIONS': {
+            'timeout': SQLITE_BUSY_TIMEOUT,
+            'transaction_mode': 'IMMEDIATE',
+            'init_command': SQLITE_PRAGMAS,
+        },
     }
 }
 
+# 읽기 전용 replica (지정하면 목록 / 추천 조회와 배치 분석 작업의 읽기를 보냄)
+# 로컬에서는 sync_replica 명령으로 default 를 복사해서 복제를 흉내 냄
+DATABASE_REPLICA_NAME = env("DATABASE_REPLICA_NAME", default="")
+if DATABASE_REPLICA_NAME:
+    DATABASES['replica'] = {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': DATABASE_REPLICA_NAME,
+        'CONN_MAX_AGE': DATABASES['default']['CONN_MAX_AGE'],
+        'CONN_HEALTH_CHECKS': True,
+        'OPTIONS': {
+            'timeout': SQLITE_BUSY_TIMEOUT,
+            'init_command': SQLITE_PRAGMAS + ";PRAGMA query_only=1",
+        },
+        'TEST': {'MIRROR': 'default'},
+    }
+
+DATABASE_ROUTERS = ['project.db_router.ReplicaRouter']
+# 쓰기를 한 유저의 읽기를 primary 에 고정하는 시간 (초, 복제 지연보다 길게)
+DB_REPLICA_PIN_SECONDS = env.int("DB_REPLICA_PIN_SECONDS", default=5)
+
+# 캐시 : 추천 캐시 세대 번호, 목록 캐시 칸 버전, replica 고정, 캐시 통계를
+# 모든 웹 워커 / Celery 워커 / 관리 명령이 같이 봐야 하므로 Celery 와 같은 Redis 를 기본으로 사용
+# (프로세스별 locmem 은 테스트에서만)
+TESTING = len(sys.argv) > 1 and sys.argv[1] == 'test'
+CACHES = {
+    'default': env.cache('CACHE_URL', default='rediscache://127.0.0.1:6379/1'),
+}
+if TESTING:
+    CACHES = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+
 #업로드 파일 최대 크기
 DATA_UPLOAD_MAX_MEMORY_SIZE = 200 * 1024 * 1024  # 200MB
 FILE_UPLOAD_MAX_MEMORY_SIZE = 200 * 1024 * 1024  # 200MB
@@ -196,6 +315,10 @@ CELERY_BEAT_SCHEDULE = {
         'task': 'products.tasks.daily_embedding_refresh',
         'schedule': 3600.0, 
     },
+    'nightly-precompute-recommendations': {
+        'task': 'accounts.tasks.precompute_user_recommendations',
+        'schedule': crontab(hour=3, minute=0),
+    },
 }
 
 
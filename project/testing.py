@@ -0,0 +1,67 @@
+import itertools
+from datetime import timedelta
+
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from accounts.models import User
+from categories.models import Category
+from products.models import Product
+from stores.models import Store
+
+# ------------------------------------------------
+# 테스트 공용 도구
+#
+# 테스트 데이터는 검사에 필요한 필드만 넘기고 나머지는 기본값으로 만든다.
+# 유저는 비밀번호 없이 (해싱 시간 절약), 이메일은 테스트 실행 동안 겹치지 않는 번호로.
+
+_numbers = itertools.count()
+
+STORE_DEFAULTS = {
+    "opening_time": "09:00", "address": "-", "latitude": 37.5, "longitude": 127.0, "is_open": True,
+}
+PRODUCT_DEFAULTS = {
+    "description": "", "price": 1000, "discount_price": 500, "stock": 3,
+}
+
+
+def make_user(role="consumer"):
+    return User.objects.create_user(f"{role}{next(_numbers)}@example.com", None, role=role, name=role)
+
+
+def make_category(name="test"):
+    return Category.objects.get_or_create(name=name)[0]
+
+
+def make_store(**fields):
+    seller = make_user("seller")
+    fields = {**STORE_DEFAULTS, "store_name": f"가게 {seller.id}", **fields}
+    return Store.objects.create(seller=seller, **fields)
+
+
+# 가게 하나 + 상품 count 개 -> (가게, 상품 목록), 상품 이름은 "<가게 이름> 상품 <번호>"
+def make_store_with_products(count=1, store_fields=None, category=None, **product_fields):
+    store = make_store(**(store_fields or {}))
+    category = category or make_category()
+    fields = {**PRODUCT_DEFAULTS, "expiration_date": timezone.now() + timedelta(days=1), **product_fields}
+    products = Product.objects.bulk_create(
+        Product(store=store, category=category, name=f"{store.store_name} 상품 {i}", **fields)
+        for i in range(count)
+    )
+    return store, products
+
+
+# 뷰셋 query_budgets 를 실제 요청으로 검사 (JWT 인증 포함, 예산을 넘으면 QueryBudgetExceeded 로 실패)
+@override_settings(QUERY_INSTRUMENTATION=True, QUERY_BUDGET_STRICT=True)
+class QueryBudgetTestCase(TestCase):
+    def budget_client(self, user):
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {RefreshToken.for_user(user).access_token}")
+        return client
+
+    def assertWithinBudget(self, response):
+        self.assertEqual(response.status_code, 200)
+        # 예산을 선언하지 않은 action 은 검사되지 않으므로 선언 여부도 확인
+        self.assertIn("X-Query-Budget", response)
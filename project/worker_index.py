@@ -0,0 +1,62 @@
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.utils import timezone
+
+# ------------------------------------------------
+# 워커 메모리 인덱스 동기화
+#
+# 처음 사용할 때 전체를 읽어서 만들고, refresh 주기마다 마지막 동기화 이후
+# updated_at 이 바뀐 행만 다시 읽어 반영한다. rebuild 주기마다 (삭제된 행 정리 /
+# 인기도 같은 집계 갱신을 위해) 전체를 새로 만든다.
+# 사용 : 추천 후보 특성 테이블, 가게 공간 인덱스, 자동완성 인덱스
+#
+#   build(*args)        -> 새 인덱스
+#   update(index, since) : since 이후 바뀐 행 반영
+#   outdated(index, *args) -> True 면 주기와 관계없이 새로 만듦 (예: 임베딩 스냅샷 교체)
+# 주기는 설정 이름으로 받아서 호출할 때마다 읽는다.
+
+# 늦게 커밋된 트랜잭션을 놓치지 않도록 이전 동기화 시각보다 조금 앞에서부터 다시 읽음
+SYNC_OVERLAP = timedelta(seconds=30)
+
+
+class WorkerIndex:
+    def __init__(self, build, update, refresh_setting, rebuild_setting=None, outdated=None):
+        self.build = build
+        self.update = update
+        self.refresh_setting = refresh_setting
+        self.rebuild_setting = rebuild_setting
+        self.outdated = outdated
+        self.current = None
+        self.synced_at = None
+        self.built_at = 0.0
+        self.checked_at = 0.0
+
+    def _due(self, setting, since, now):
+        return setting is not None and now - since >= getattr(settings, setting)
+
+    def get(self, *args):
+        index, now = self.current, time.monotonic()
+        if (
+            index is None
+            or self._due(self.rebuild_setting, self.built_at, now)
+            or (self.outdated is not None and self.outdated(index, *args))
+        ):
+            return self.rebuild(*args)
+        if self._due(self.refresh_setting, self.checked_at, now):
+            self.refresh()
+        return self.current
+
+    def rebuild(self, *args):
+        synced_at = timezone.now()
+        self.current = self.build(*args)
+        self.synced_at = synced_at
+        self.built_at = self.checked_at = time.monotonic()
+        return self.current
+
+    def refresh(self):
+        since, now = self.synced_at - SYNC_OVERLAP, timezone.now()
+        self.update(self.current, since)
+        self.synced_at = now
+        self.checked_at = time.monotonic()
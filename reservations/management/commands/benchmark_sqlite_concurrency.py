@@ -0,0 +1,191 @@
+import random
+import sqlite3
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+
+SCHEMA = [
+    "CREATE TABLE product (id INTEGER PRIMARY KEY, store_id INTEGER, stock INTEGER, "
+    "is_active INTEGER, expiration_date REAL)",
+    "CREATE TABLE reservation (id INTEGER PRIMARY KEY, product_id INTEGER, quantity INTEGER, "
+    "status TEXT, created_at REAL)",
+    "CREATE INDEX product_store ON product (store_id) WHERE is_active",
+    "CREATE INDEX product_expiry ON product (expiration_date) WHERE is_active",
+    "CREATE INDEX reservation_status ON reservation (status, created_at)",
+]
+
+# 기본 SQLite (롤백 저널, DEFERRED 트랜잭션, 파이썬 기본 대기 5초) vs settings 의 운영 설정
+MODES = {
+    "default": {"pragmas": [], "begin": "BEGIN", "timeout": 5.0},
+    "tuned": {
+        "pragmas": [p for p in settings.SQLITE_PRAGMAS.split(";") if p.strip()],
+        "begin": "BEGIN IMMEDIATE",
+        "timeout": float(settings.SQLITE_BUSY_TIMEOUT),
+    },
+}
+
+
+class Stats:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.writes = 0
+        self.reads = 0
+        self.jobs = 0
+        self.errors = 0
+        self.lock_wait = 0.0
+        self.latencies = []
+
+    def add(self, field, value=1):
+        with self._lock:
+            setattr(self, field, getattr(self, field) + value)
+
+
+def _connect(path, mode):
+    conn = sqlite3.connect(path, timeout=mode["timeout"], isolation_level=None, check_same_thread=False)
+    for pragma in mode["pragmas"]:
+        conn.execute(pragma)
+    return conn
+
+
+def _write(conn, mode, stats, sql_steps):
+    started = time.perf_counter()
+    try:
+        # 쓰기 잠금을 잡는 데 걸린 시간 = BEGIN(IMMEDIATE) 또는 첫 쓰기 문장까지
+        conn.execute(mode["begin"])
+        acquired = None
+        for sql, params, is_write in sql_steps:
+            conn.execute(sql, params)
+            if is_write and acquired is None:
+                acquired = time.perf_counter()
+        conn.execute("COMMIT")
+        stats.add("lock_wait", (acquired or time.perf_counter()) - started)
+        return time.perf_counter() - started
+    except sqlite3.OperationalError:
+        stats.add("errors")
+        if conn.in_transaction:
+            conn.execute("ROLLBACK")
+        return None
+
+
+# 예약 생성 : 재고 확인 -> 예약 추가 -> 재고 차감 (한 트랜잭션)
+def _writer(path, mode, stats, n_products, stop):
+    conn = _connect(path, mode)
+    rng = random.Random(threading.get_ident())
+    while not stop.is_set():
+        pid = rng.randrange(1, n_products + 1)
+        elapsed = _write(conn, mode, stats, [
+            ("SELECT stock FROM product WHERE id = ?", (pid,), False),
+            ("INSERT INTO reservation (product_id, quantity, status, created_at) VALUES (?, 1, 'pending', ?)",
+             (pid, time.time()), True),
+            ("UPDATE product SET stock = stock - 1 WHERE id = ?", (pid,), True),
+        ])
+        if elapsed is not None:
+            stats.add("writes")
+            with stats._lock:
+                stats.latencies.append(elapsed)
+    conn.close()
+
+
+# 근처 상품 목록 조회
+def _reader(path, mode, stats, n_stores, stop):
+    conn = _connect(path, mode)
+    rng = random.Random(threading.get_ident())
+    while not stop.is_set():
+        stores = [rng.randrange(n_stores) for _ in range(10)]
+        marks = ",".join("?" * len(stores))
+        try:
+            conn.execute(
+                f"SELECT id FROM product WHERE is_active AND store_id IN ({marks}) ORDER BY id DESC LIMIT 20",
+                stores,
+            ).fetchall()
+            stats.add("reads")
+        except sqlite3.OperationalError:
+            stats.add("errors")
+    conn.close()
+
+
+# 30초 주기 작업 (유통기한 만료 + 대기 예약 자동 취소) 을 interval 마다
+def _jobs(path, mode, stats, interval, stop):
+    conn = _connect(path, mode)
+    while not stop.wait(interval):
+        now = time.time()
+        elapsed = _write(conn, mode, stats, [
+            ("UPDATE product SET is_active = 0 WHERE is_active AND expiration_date < ?", (now,), True),
+            ("UPDATE reservation SET status = 'cancel' WHERE status = 'pending' AND created_at < ?",
+             (now - 1.0,), True),
+        ])
+        if elapsed is not None:
+            stats.add("jobs")
+    conn.close()
+
+
+class Command(BaseCommand):
+    help = "Benchmark concurrent reservation writes, listing reads and expiry jobs on SQLite"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--writers", type=int, default=8)
+        parser.add_argument("--readers", type=int, default=4)
+        parser.add_argument("--seconds", type=float, default=5.0)
+        parser.add_argument("--products", type=int, default=20_000)
+        parser.add_argument("--stores", type=int, default=500)
+        parser.add_argument("--job-interval", type=float, default=0.05, help="Seconds between expiry job runs")
+
+    def handle(self, *args, **options):
+        for name, mode in MODES.items():
+            with tempfile.TemporaryDirectory() as tmp:
+                path = str(Path(tmp) / "bench.sqlite3")
+                self._prepare(path, mode, options)
+                stats = self._run(path, mode, options)
+            self._report(name, stats, options["seconds"])
+
+    def _prepare(self, path, mode, options):
+        conn = _connect(path, mode)
+        for sql in SCHEMA:
+            conn.execute(sql)
+        rng = random.Random(0)
+        now = time.time()
+        conn.execute("BEGIN")
+        conn.executemany(
+            "INSERT INTO product (id, store_id, stock, is_active, expiration_date) VALUES (?, ?, ?, 1, ?)",
+            [
+                (i, rng.randrange(options["stores"]), 1_000_000, now + rng.uniform(0, options["seconds"] * 2))
+                for i in range(1, options["products"] + 1)
+            ],
+        )
+        conn.execute("COMMIT")
+        conn.close()
+
+    def _run(self, path, mode, options):
+        stats, stop = Stats(), threading.Event()
+        threads = [
+            threading.Thread(target=_writer, args=(path, mode, stats, options["products"], stop))
+            for _ in range(options["writers"])
+        ] + [
+            threading.Thread(target=_reader, args=(path, mode, stats, options["stores"], stop))
+            for _ in range(options["readers"])
+        ] + [
+            threading.Thread(target=_jobs, args=(path, mode, stats, options["job_interval"], stop)),
+        ]
+        for thread in threads:
+            thread.start()
+        time.sleep(options["seconds"])
+        stop.set()
+        for thread in threads:
+            thread.join()
+        return stats
+
+    def _report(self, name, stats, seconds):
+        latencies = sorted(stats.latencies)
+        p95 = latencies[int(len(latencies) * 0.95)] * 1000 if latencies else 0.0
+        transactions = stats.writes + stats.jobs
+        self.stdout.write(
+            f"{name:8s} writes/s={stats.writes / seconds:8.1f} reads/s={stats.reads / seconds:8.1f} "
+            f"jobs={stats.jobs:4d} locked_errors={stats.errors:5d} "
+            f"lock_wait={stats.lock_wait * 1000 / max(transactions, 1):7.2f} ms/txn "
+            f"write_p95={p95:7.2f} ms"
+        )
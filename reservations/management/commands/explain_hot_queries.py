@@ -0,0 +1,50 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.utils import timezone
+from products.models import Product
+from reservations.models import Reservation, Notification
+from stores.models import Store
+
+
+# 자주 실행되는 쿼리가 의도한 인덱스를 타는지 EXPLAIN QUERY PLAN 으로 확인 (reservations.tests 에서도 같은 목록을 검사)
+def hot_queries():
+    now = timezone.now()
+    return [
+        ("가게별 활성 상품 최신순", "product_active_store_idx",
+         Product.objects.filter(is_active=True, store_id=1).order_by("-id")),
+        ("유통기한 만료 작업", "product_active_expiry_idx",
+         Product.objects.filter(is_active=True, expiration_date__lt=now)),
+        ("특가 상품", "product_active_discount_idx",
+         Product.objects.filter(is_active=True, discount_rate__gte=30)),
+        ("대기 예약 자동 취소", "reservation_status_created_idx",
+         Reservation.objects.filter(status="pending", created_at__lte=now)),
+        ("상품별 예약 상태", "reservation_product_status_idx",
+         Reservation.objects.filter(product_id=1, status="pending")),
+        ("예약별 안 읽은 알림", "notification_unread_idx",
+         Notification.objects.filter(reservation_id=1, is_read=False)),
+        ("워커 인덱스 상품 변경분", "product_updated_idx",
+         Product.objects.changed_since(now)),
+        ("워커 인덱스 가게 변경분", "store_updated_idx",
+         Store.objects.filter(updated_at__gte=now)),
+    ]
+
+
+class Command(BaseCommand):
+    help = "Verify that hot filter paths use their indexes (EXPLAIN QUERY PLAN)"
+
+    def handle(self, *args, **options):
+        if connection.vendor != "sqlite":
+            raise CommandError("EXPLAIN QUERY PLAN check is only implemented for SQLite.")
+
+        missing = []
+        for label, index, queryset in hot_queries():
+            plan = queryset.explain()
+            used = index in plan
+            self.stdout.write(f"[{'OK' if used else 'MISS'}] {label} ({index})")
+            for line in plan.splitlines():
+                self.stdout.write(f"    {line}")
+            if not used:
+                missing.append(index)
+
+        if missing:
+            raise CommandError(f"indexes not used: {', '.join(missing)}")
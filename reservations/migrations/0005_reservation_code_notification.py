@@ -0,0 +1,64 @@
+# Generated by Django 5.2.4 on 2026-10-17 17:39
+
+import django.db.models.deletion
+import reservations.models
+from django.db import migrations, models
+
+
+# 기존 예약에 서로 다른 예약 코드 채우기 (AddField 의 default 는 모든 행에 같은 값이 들어감)
+def fill_reservation_codes(apps, schema_editor):
+    Reservation = apps.get_model('reservations', 'Reservation')
+    used = set()
+    for reservation in Reservation.objects.all().only('id'):
+        code = reservations.models._generate_code()
+        while code in used:
+            code = reservations.models._generate_code()
+        used.add(code)
+        reservation.reservation_code = code
+        reservation.save(update_fields=['reservation_code'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reservations', '0004_alter_reservation_status'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='reservation',
+            name='reservation_code',
+            field=models.CharField(editable=False, max_length=6, null=True),
+        ),
+        migrations.RunPython(fill_reservation_codes, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='reservation',
+            name='reservation_code',
+            field=models.CharField(default=reservations.models._generate_code, editable=False, max_length=6, unique=True),
+        ),
+        migrations.AlterField(
+            model_name='reservation',
+            name='status',
+            field=models.CharField(choices=[('pending', 'Pending'), ('confirm', 'Confirm'), ('pickup', 'PickUp'), ('ready', 'Ready'), ('cancel', 'Cancel')], default='pending', max_length=20),
+        ),
+        migrations.CreateModel(
+            name='Notification',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('status', models.CharField(choices=[('confirm', 'Confirm'), ('pickup', 'PickUp'), ('ready', 'Ready'), ('cancel', 'Cancel')], max_length=20)),
+                ('is_read', models.BooleanField(default=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('reservation', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='notifications', to='reservations.reservation')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='ReservationCancelReason',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('reason', models.TextField()),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('reservation', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='cancel_reason', to='reservations.reservation')),
+            ],
+        ),
+    ]
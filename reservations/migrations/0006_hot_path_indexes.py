@@ -0,0 +1,28 @@
+# Generated by Django 5.2.4 on 2026-10-17 17:39
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0007_hot_path_indexes'),
+        ('reservations', '0005_reservation_code_notification'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='notification',
+            index=models.Index(condition=models.Q(('is_read', False)), fields=['reservation'], name='notification_unread_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='reservation',
+            index=models.Index(fields=['status', 'created_at'], name='reservation_status_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='reservation',
+            index=models.Index(fields=['product', 'status'], name='reservation_product_status_idx'),
+        ),
+    ]
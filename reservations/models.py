@@ -29,6 +29,14 @@ class Reservation(models.Model):
     #confirm
     reserved_at = models.DateTimeField(null=True, blank=True)
 
+    class Meta:
+        indexes = [
+            # 대기 예약 자동 취소 작업 (30초마다)
+            models.Index(fields=["status", "created_at"], name="reservation_status_created_idx"),
+            # 상품별 예약 상태 조회
+            models.Index(fields=["product", "status"], name="reservation_product_status_idx"),
+        ]
+
     def __str__(self):
         return f"[{self.id} / {self.reservation_code}] {self.consumer.email} - {self.product.name} ({self.status}) / 가게명 : {self.product.store.store_name}"
     
@@ -71,6 +79,12 @@ class Notification(models.Model):
     is_read = models.BooleanField(default = False)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
-    
+
+    class Meta:
+        indexes = [
+            # 예약별 안 읽은 알림
+            models.Index(fields=["reservation"], condition=models.Q(is_read=False), name="notification_unread_idx"),
+        ]
+
     def __str__(self):
         return f"[{self.id}] 예약 : {self.reservation.id} / 상태 : {self.status} / ({'읽음' if self.is_read else '안읽음'})"
\ No newline at end of file
@@ -15,6 +15,12 @@ class ReservationReadSerializer(serializers.ModelSerializer):
     reserved_at = serializers.DateTimeField(read_only=True)
     pickup_time = serializers.SerializerMethodField()
     status = serializers.CharField(read_only=True)
+
+    # 아래 get_* 에서 접근하는 관계 (필드를 바꾸면 같이 수정)
+    # cancel_reason 은 역방향 OneToOne 이라 select_related 로 함께 가져옴 (없으면 None 으로 캐시)
+    select_related_fields = ("consumer", "product__store__seller", "cancel_reason")
+    prefetch_related_fields = ()
+
     class Meta:
         model = Reservation
         fields = [
@@ -25,6 +31,16 @@ class ReservationReadSerializer(serializers.ModelSerializer):
             "status"
         ]
         read_only_fields = ['status', 'created_at', 'reserved_at']
+
+    # 목록 / 상세 queryset 에 위 관계를 붙여서 예약 수와 관계없이 쿼리 수를 일정하게
+    # (select_related() 를 인자 없이 부르면 모든 FK 를 조인하므로 비어 있으면 건너뜀)
+    @classmethod
+    def setup_queryset(cls, queryset):
+        if cls.select_related_fields:
+            queryset = queryset.select_related(*cls.select_related_fields)
+        if cls.prefetch_related_fields:
+            queryset = queryset.prefetch_related(*cls.prefetch_related_fields)
+        return queryset
         
     def get_consumer(self, obj):
         user = obj.consumer
@@ -58,7 +74,7 @@ class ReservationReadSerializer(serializers.ModelSerializer):
             "quantity" : obj.quantity,
             "name" : getattr(product, "name", ""),
             "total_price" : product.discount_price * obj.quantity,
-            "image" :obj.product.image.url if obj.product.image else None,
+            "image" :product.image.url if product.image else None,
             "expire_date" : product.expiration_date,
         }
         
@@ -111,7 +127,7 @@ class ReservationCreateSerializer(serializers.ModelSerializer):
         product.stock -= quantity
         if product.stock == 0:
             product.is_active = False
-        product.save()
+        product.save(update_fields=["stock", "is_active", "updated_at"])
 
         reservation = Reservation.objects.create(
             consumer=user,
@@ -182,7 +198,7 @@ class ReservationUpdateSerializer(serializers.ModelSerializer):
             product = instance.product
             product.stock += instance.quantity
             product.is_active = True
-            product.save()
+            product.save(update_fields=["stock", "is_active", "updated_at"])
 
         #상태 변경
         instance.status = new_status
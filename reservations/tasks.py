@@ -21,7 +21,7 @@ def cancel_expired_reservations():
         # 재고 복구
         product.stock += reservation.quantity
         product.is_active = True
-        product.save()
+        product.save(update_fields=["stock", "is_active", "updated_at"])
 
         # 취소 사유 및 상태 변경
         update_data = {
@@ -0,0 +1,74 @@
+from unittest import skipUnless
+
+from django.db import connection
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from project.query_budget import query_budget, record_queries
+from project.testing import QueryBudgetTestCase, make_store_with_products, make_user
+
+from .management.commands.explain_hot_queries import hot_queries
+from .models import Reservation, ReservationCancelReason
+from .serializers import ReservationReadSerializer
+
+
+# 예약 목록 직렬화 쿼리 수가 예약 수와 관계없이 일정한지 (N+1 회귀 방지)
+class ReservationListQueryTests(QueryBudgetTestCase):
+    RESERVATIONS = 500
+    STORES = 20
+
+    @classmethod
+    def setUpTestData(cls):
+        products = []
+        for _ in range(cls.STORES):
+            _, (product,) = make_store_with_products(stock=cls.RESERVATIONS, image="products/x.jpg", discount_rate=50)
+            products.append(product)
+        cls.seller = product.store.seller
+        cls.consumer = make_user()
+        reservations = Reservation.objects.bulk_create(
+            Reservation(consumer=cls.consumer, product=products[i % cls.STORES], quantity=1,
+                        status="cancel" if i % 5 == 0 else "pending")
+            for i in range(cls.RESERVATIONS)
+        )
+        ReservationCancelReason.objects.bulk_create(
+            ReservationCancelReason(reservation=r, reason="변심")
+            for r in reservations if r.status == "cancel"
+        )
+
+    def test_serializer_uses_one_query(self):
+        queryset = ReservationReadSerializer.setup_queryset(Reservation.objects.filter(consumer=self.consumer))
+        # 예약 + 소비자 + 상품 + 가게 + 판매자 + 취소 사유 조인 한 번
+        with query_budget(1, f"{self.RESERVATIONS} reservations"):
+            data = ReservationReadSerializer(queryset, many=True).data
+        self.assertEqual(len(data), self.RESERVATIONS)
+        self.assertEqual(sum(1 for row in data if row["cancel_reason"] == "변심"), self.RESERVATIONS // 5)
+
+    def test_list_query_count_does_not_grow_with_page_size(self):
+        client = APIClient()
+        client.force_authenticate(self.consumer)
+        counts = []
+        for page_size in (10, 100):
+            with record_queries() as log:
+                response = client.get("/reservations/", {"page_size": page_size})
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(len(response.data["results"]), page_size)
+            counts.append(log.count)
+        self.assertEqual(counts[0], counts[1])
+
+    # 뷰셋 query_budgets (JWT 인증 포함)
+    def test_endpoints_within_budget(self):
+        reservation = Reservation.objects.filter(consumer=self.consumer).first()
+        for user in (self.consumer, self.seller):
+            client = self.budget_client(user)
+            with self.subTest(user.role):
+                self.assertWithinBudget(client.get("/reservations/", {"page_size": 100}))
+        self.assertWithinBudget(self.budget_client(self.consumer).get(f"/reservations/{reservation.id}/"))
+
+
+# 자주 실행되는 필터가 의도한 (부분) 인덱스를 타는지 (EXPLAIN QUERY PLAN)
+@skipUnless(connection.vendor == "sqlite", "EXPLAIN QUERY PLAN check is only implemented for SQLite")
+class HotQueryIndexTests(TestCase):
+    def test_hot_queries_use_their_indexes(self):
+        for label, index, queryset in hot_queries():
+            with self.subTest(label, index=index):
+                self.assertIn(index, queryset.explain())
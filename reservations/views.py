@@ -4,14 +4,19 @@ from rest_framework.response import Response
 
 from rest_framework.permissions import IsAuthenticated
 from accounts.permissions import IsSeller, IsConsumer
+from project.pagination import KeysetPagination
+from project.db_router import ReplicaReadMixin
 
 from django.utils.dateparse import parse_date
 
 from .models import Reservation, Notification
 from .serializers import ReservationReadSerializer, ReservationCreateSerializer, ReservationUpdateSerializer, NotificationSerializer
 
-class ReservationViewSet(viewsets.ModelViewSet):
+class ReservationViewSet(ReplicaReadMixin, viewsets.ModelViewSet):
+    replica_actions = ("list", "retrieve")
+    query_budgets = {"list": 4, "retrieve": 4}
     queryset = Reservation.objects.all()
+    pagination_class = KeysetPagination
 
     def get_serializer_class(self):
         if self.action == 'create':
@@ -28,7 +33,8 @@ class ReservationViewSet(viewsets.ModelViewSet):
 
     def get_queryset(self):
         user = self.request.user
-        qs = Reservation.objects.all()
+        # 시리얼라이저가 쓰는 관계를 한 번에 조회 (N+1 방지)
+        qs = ReservationReadSerializer.setup_queryset(Reservation.objects.all())
         
         if user.role == 'seller':
             qs = qs.filter(product__store__seller=user)
@@ -62,8 +68,9 @@ class ReservationViewSet(viewsets.ModelViewSet):
 
     def list(self, request, *args, **kwargs):
         queryset = self.get_queryset()
-        serializer = self.get_serializer(queryset, many=True)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        page = self.paginate_queryset(queryset)
+        serializer = self.get_serializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
 
     # 예약 상태 변경 권한 검사
     def _check_seller_owns_reservation(self, reservation):
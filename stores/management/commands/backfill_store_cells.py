@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+from stores.models import Store
+from stores.utils.cells import backfill_cells
+
+
+# geo_cell 다시 채우기 (기존 가게는 마이그레이션 0004 에서 채움, CELL_DEGREES 변경 후 다시 실행)
+class Command(BaseCommand):
+    help = "Recompute Store.geo_cell for every store"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        changed = backfill_cells(Store, options["batch_size"])
+        self.stdout.write(f"updated {changed} stores")
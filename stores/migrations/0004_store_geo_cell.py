@@ -0,0 +1,32 @@
+# Generated by Django 5.2.4 on 2026-10-17 17:29
+
+from django.conf import settings
+from django.db import migrations, models
+
+from stores.utils.cells import backfill_cells
+
+
+# 기존 가게의 격자 칸 채우기 (비어 있으면 DB 반경 질의에서 빠짐)
+def fill_geo_cells(apps, schema_editor):
+    backfill_cells(apps.get_model("stores", "Store"))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('stores', '0003_alter_store_seller'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='store',
+            name='geo_cell',
+            field=models.CharField(blank=True, db_index=True, default='', editable=False, max_length=32),
+        ),
+        migrations.AddIndex(
+            model_name='store',
+            index=models.Index(fields=['latitude', 'longitude'], name='store_lat_lng_idx'),
+        ),
+        migrations.RunPython(fill_geo_cells, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.4 on 2026-10-17 18:14
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('stores', '0004_store_geo_cell'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='store',
+            index=models.Index(fields=['updated_at'], name='store_updated_idx'),
+        ),
+    ]
@@ -1,5 +1,7 @@
 from django.db import models
 
+from .utils.cells import cell_of
+
 # 상점 (판매자 1:1 관계)
 class Store(models.Model):
     seller = models.OneToOneField(
@@ -14,11 +16,28 @@ class Store(models.Model):
     address = models.CharField(max_length=200)
     latitude = models.DecimalField(max_digits=9, decimal_places=6)
     longitude = models.DecimalField(max_digits=9, decimal_places=6)
+    # 위경도 격자 칸 (저장 시 자동 계산, 반경 질의 DB 사전 필터용)
+    geo_cell = models.CharField(max_length=32, blank=True, default="", db_index=True, editable=False)
     business_license = models.FileField(upload_to='licenses/', blank=True, null=True)
     permit_doc = models.FileField(upload_to='permits/', blank=True, null=True)
     bank_copy = models.FileField(upload_to='bank_copies/', blank=True, null=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
-    
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["latitude", "longitude"], name="store_lat_lng_idx"),
+            # 워커 메모리 인덱스의 변경분 조회 (updated_at >= 마지막 동기화)
+            models.Index(fields=["updated_at"], name="store_updated_idx"),
+        ]
+
+    def save(self, *args, **kwargs):
+        self.geo_cell = cell_of(self.latitude, self.longitude)
+        # 좌표만 골라 저장하는 경우에도 칸이 같이 바뀌도록
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and {"latitude", "longitude"} & set(update_fields):
+            kwargs["update_fields"] = {*update_fields, "geo_cell"}
+        super().save(*args, **kwargs)
+
     def __str__(self):
         return f"[{self.id}] {self.store_name} - ({self.seller.name}/{self.seller.email})"
\ No newline at end of file
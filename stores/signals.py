@@ -0,0 +1,13 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from .models import Store
+from .utils.spatial import update_store, remove_store
+
+# 가게 저장 / 오픈 토글 / 삭제 시 공간 인덱스 반영
+@receiver(post_save, sender=Store)
+def sync_store_index(sender, instance, **kwargs):
+    update_store(instance)
+
+@receiver(post_delete, sender=Store)
+def remove_store_from_index(sender, instance, **kwargs):
+    remove_store(instance.id)
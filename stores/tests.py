@@ -0,0 +1,76 @@
+import math
+import random
+
+import numpy as np
+from django.test import TestCase
+
+from accounts.models import User
+from project.testing import STORE_DEFAULTS, QueryBudgetTestCase, make_store, make_user
+
+from .models import Store
+from .utils.cells import EARTH_RADIUS_KM, cell_of
+from .utils.spatial import StoreGrid, haversine_km, nearby_store_distances_db
+
+
+# 격자 인덱스 / DB 반경 질의가 전체 가게 haversine 결과와 같은지 (위경도 범위가 원을 다 덮는지)
+class NearbyStoreTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        rng = random.Random(1)
+        sellers = User.objects.bulk_create(
+            User(email=f"bulk-seller{i}@example.com", role="seller", name="s") for i in range(2000)
+        )
+        stores = []
+        for seller in sellers:
+            lat, lng = round(37 + rng.random(), 6), round(127 + rng.random(), 6)
+            stores.append(Store(
+                seller=seller, store_name="가게",
+                **{**STORE_DEFAULTS, "latitude": lat, "longitude": lng}, geo_cell=cell_of(lat, lng),
+            ))
+        Store.objects.bulk_create(stores)
+        cls.rows = list(Store.objects.values_list("id", "latitude", "longitude", "is_open"))
+
+    def test_radius_queries_match_brute_force(self):
+        grid = StoreGrid(0.01)
+        grid.load(self.rows)
+        ids = np.array([row[0] for row in self.rows])
+        lats = np.array([float(row[1]) for row in self.rows])
+        lngs = np.array([float(row[2]) for row in self.rows])
+
+        rng = random.Random(2)
+        for _ in range(200):
+            lat, lng, radius = 37 + rng.random(), 127 + rng.random(), rng.uniform(0.5, 30)
+            expected = sorted(ids[haversine_km(lat, lng, lats, lngs) <= radius].tolist())
+            with self.subTest(lat=lat, lng=lng, radius=radius):
+                self.assertEqual(sorted(grid.within(lat, lng, radius)), expected)
+                self.assertEqual(sorted(nearby_store_distances_db(lat, lng, radius)[0].tolist()), expected)
+
+    # 원의 경도 끝점은 중심보다 극 쪽 위도에 있음 -> 범위 경계 바로 안쪽 가게도 찾아야 함
+    def test_store_at_east_edge_of_radius(self):
+        lat, lng, radius = 37.0, 127.0, 30.0
+        angle = radius / EARTH_RADIUS_KM
+        edge_lat = math.degrees(math.asin(math.sin(math.radians(lat)) / math.cos(angle)))
+        edge_lng = lng + 0.999 * math.degrees(math.asin(math.sin(angle) / math.cos(math.radians(lat))))
+        store = make_store(latitude=round(edge_lat, 6), longitude=round(edge_lng, 6))
+        grid = StoreGrid(0.01)
+        grid.load(Store.objects.values_list("id", "latitude", "longitude", "is_open"))
+        self.assertIn(store.id, grid.within(lat, lng, radius))
+        self.assertIn(store.id, nearby_store_distances_db(lat, lng, radius)[0].tolist())
+
+
+# 가게 목록 / 상세가 StoreViewSet.query_budgets 안에서 끝나는지 (가게 수와 무관)
+class StoreQueryBudgetTests(QueryBudgetTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        sellers = User.objects.bulk_create(
+            User(email=f"bulk-seller{i}@example.com", role="seller", name="s") for i in range(30)
+        )
+        cls.stores = Store.objects.bulk_create(
+            Store(seller=seller, store_name="가게", **STORE_DEFAULTS) for seller in sellers
+        )
+        cls.consumer = make_user()
+
+    def test_endpoints_within_budget(self):
+        client = self.budget_client(self.consumer)
+        self.assertWithinBudget(client.get("/stores/", {"page_size": 100}))
+        self.assertWithinBudget(client.get(f"/stores/{self.stores[0].id}/"))
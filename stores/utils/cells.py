@@ -0,0 +1,68 @@
+import math
+
+# ------------------------------------------------
+# DB 격자 칸 (Store.geo_cell 컬럼)
+#
+# 위도/경도를 CELL_DEGREES 크기의 칸으로 나눈 "i:j" 문자열을 인덱스 컬럼에 저장해서
+# 반경 질의 시 `geo_cell IN (...)` + 위경도 범위로 DB 에서 먼저 후보 가게를 줄인다.
+# CELL_DEGREES 를 바꾸면 backfill_store_cells 명령으로 전체를 다시 채워야 함
+
+CELL_DEGREES = 0.05     # ≒ 5.5km
+
+# haversine 거리 계산 (spatial.haversine_km) 과 같은 지구 반지름
+EARTH_RADIUS_KM = 6371.0
+KM_PER_DEGREE = math.pi * EARTH_RADIUS_KM / 180
+
+# 칸이 이보다 많이 필요하면 (넓은 반경) IN 조건 없이 위경도 범위만 사용
+MAX_QUERY_CELLS = 64
+
+
+def _index(value):
+    return int(math.floor(float(value) / CELL_DEGREES))
+
+
+def cell_of(lat, lng):
+    if lat is None or lng is None:
+        return ""
+    return f"{_index(lat)}:{_index(lng)}"
+
+
+# (lat, lng) 중심 radius_km 반경을 덮는 위경도 범위 -> (min_lat, max_lat, min_lng, max_lng)
+# 경도 폭은 범위 안에서 극에 가장 가까운 위도 기준 (원은 중심보다 극 쪽에서 경도로 더 넓음)
+def bounding_box(lat, lng, radius_km):
+    lat, lng = float(lat), float(lng)
+    dlat = radius_km / KM_PER_DEGREE
+    far_lat = min(abs(lat) + dlat, 90.0)
+    dlng = radius_km / (KM_PER_DEGREE * max(math.cos(math.radians(far_lat)), 1e-6))
+    return lat - dlat, lat + dlat, lng - dlng, lng + dlng
+
+
+# 범위를 덮는 칸 목록 (너무 많으면 None)
+def cells_covering(lat, lng, radius_km):
+    min_lat, max_lat, min_lng, max_lng = bounding_box(lat, lng, radius_km)
+    i0, i1 = _index(min_lat), _index(max_lat)
+    j0, j1 = _index(min_lng), _index(max_lng)
+    if (i1 - i0 + 1) * (j1 - j0 + 1) > MAX_QUERY_CELLS:
+        return None
+    return [f"{i}:{j}" for i in range(i0, i1 + 1) for j in range(j0, j1 + 1)]
+
+
+# 모든 가게의 geo_cell 다시 계산 -> 바뀐 가게 수
+# store_model : Store (마이그레이션에서는 apps.get_model 로 받은 모델)
+# save() 를 거치지 않으므로 updated_at 은 바뀌지 않음 (좌표는 그대로라 인덱스 동기화 불필요)
+def backfill_cells(store_model, batch_size=1000):
+    pending, changed = [], 0
+    stores = store_model.objects.only("id", "latitude", "longitude", "geo_cell").order_by("id")
+    for store in stores.iterator(chunk_size=batch_size):
+        cell = cell_of(store.latitude, store.longitude)
+        if cell != store.geo_cell:
+            store.geo_cell = cell
+            pending.append(store)
+        if len(pending) >= batch_size:
+            store_model.objects.bulk_update(pending, ["geo_cell"])
+            changed += len(pending)
+            pending = []
+    if pending:
+        store_model.objects.bulk_update(pending, ["geo_cell"])
+        changed += len(pending)
+    return changed
@@ -0,0 +1,185 @@
+import math
+import threading
+
+import numpy as np
+from django.conf import settings
+from django.db.models import Case, FloatField, Value, When
+
+from project.worker_index import WorkerIndex
+from stores.models import Store
+
+from .cells import EARTH_RADIUS_KM, bounding_box, cells_covering
+
+# ------------------------------------------------
+# 오픈한 가게 공간 인덱스 (위도/경도 균일 격자)
+#
+# 가게를 cell_deg 크기의 칸에 나눠 담고, 반경 질의 시 반경을 덮는 칸의 가게만
+# 배열로 모아 한 번에 haversine 거리를 계산한다. -> 전체 가게를 훑지 않음
+# 가게 저장 / 오픈 토글 시 signal 로 즉시 반영하고, 다른 워커에서 바뀐 가게는
+# updated_at 기준으로 주기적으로 읽어 온다.
+
+
+def haversine_km(lat, lng, lats, lngs):
+    lat, lng = np.radians(lat), np.radians(lng)
+    lats, lngs = np.radians(lats), np.radians(lngs)
+    a = np.sin((lats - lat) / 2) ** 2 + np.cos(lat) * np.cos(lats) * np.sin((lngs - lng) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+
+
+class StoreGrid:
+    def __init__(self, cell_deg=0.05):
+        self.cell_deg = cell_deg
+        self.cells = {}     # (i, j) -> {store_id: (lat, lng)}
+        self.where = {}     # store_id -> (i, j)
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.where)
+
+    def _cell(self, lat, lng):
+        return int(math.floor(lat / self.cell_deg)), int(math.floor(lng / self.cell_deg))
+
+    def remove(self, store_id):
+        with self._lock:
+            cell = self.where.pop(store_id, None)
+            if cell is not None:
+                members = self.cells[cell]
+                members.pop(store_id, None)
+                if not members:
+                    del self.cells[cell]
+
+    # 오픈 상태이고 좌표가 있는 가게만 인덱스에 남김
+    def upsert(self, store_id, lat, lng, is_open):
+        self.remove(store_id)
+        if not is_open or lat is None or lng is None:
+            return
+        lat, lng = float(lat), float(lng)
+        cell = self._cell(lat, lng)
+        with self._lock:
+            self.cells.setdefault(cell, {})[store_id] = (lat, lng)
+            self.where[store_id] = cell
+
+    def load(self, rows):
+        for store_id, lat, lng, is_open in rows:
+            self.upsert(store_id, lat, lng, is_open)
+
+    # 반경을 덮는 칸의 가게 -> (가게 id 목록, 좌표 목록), 반경 밖 가게도 섞여 있음
+    def candidates(self, lat, lng, radius_km):
+        min_lat, max_lat, min_lng, max_lng = bounding_box(lat, lng, radius_km)
+        i0, j0 = self._cell(min_lat, min_lng)
+        i1, j1 = self._cell(max_lat, max_lng)
+
+        ids, coords = [], []
+        with self._lock:
+            for i in range(i0, i1 + 1):
+                for j in range(j0, j1 + 1):
+                    members = self.cells.get((i, j))
+                    if members:
+                        ids.extend(members.keys())
+                        coords.extend(members.values())
+        return ids, coords
+
+    # (lat, lng) 에서 radius_km 이내 가게 -> (가게 id 배열, 거리(km) 배열)
+    def within_distances(self, lat, lng, radius_km):
+        return filter_radius(lat, lng, radius_km, *self.candidates(lat, lng, radius_km))
+
+    def within(self, lat, lng, radius_km):
+        return self.within_distances(lat, lng, radius_km)[0].tolist()
+
+
+# 후보 (id 목록, 좌표 목록) 중 radius_km 이내 -> (가게 id 배열, 거리(km) 배열)
+def filter_radius(lat, lng, radius_km, ids, coords):
+    if not len(ids):
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float64)
+    ids = np.asarray(ids, dtype=np.int64)
+    coords = np.asarray(coords, dtype=np.float64)
+    dist = haversine_km(lat, lng, coords[:, 0], coords[:, 1])
+    keep = dist <= radius_km
+    return ids[keep], dist[keep]
+
+
+FIELDS = ("id", "latitude", "longitude", "is_open")
+
+def _build():
+    grid = StoreGrid(settings.STORE_GRID_CELL_DEGREES)
+    grid.load(Store.objects.filter(is_open=True).values_list(*FIELDS))
+    return grid
+
+
+def _update(grid, since):
+    grid.load(Store.objects.filter(updated_at__gte=since).values_list(*FIELDS))
+
+
+# 워커별 인덱스 (처음 사용할 때 생성, 삭제된 가게 정리를 위해 주기적으로 전체 재생성)
+_GRID = WorkerIndex(_build, _update, "STORE_INDEX_REFRESH_SECONDS", "STORE_INDEX_REBUILD_SECONDS")
+
+
+def get_store_index():
+    return _GRID.get()
+
+
+# DB 에서 격자 칸 + 위경도 범위로 후보를 줄임 -> (가게 id 목록, 좌표 목록)
+def nearby_store_candidates_db(lat, lng, radius_km):
+    min_lat, max_lat, min_lng, max_lng = bounding_box(lat, lng, radius_km)
+    qs = Store.objects.filter(
+        is_open=True,
+        latitude__range=(min_lat, max_lat),
+        longitude__range=(min_lng, max_lng),
+    )
+    cells = cells_covering(lat, lng, radius_km)
+    if cells is not None:
+        qs = qs.filter(geo_cell__in=cells)
+
+    rows = list(qs.values_list("id", "latitude", "longitude"))
+    ids = [store_id for store_id, _, _ in rows]
+    coords = [(float(lat_), float(lng_)) for _, lat_, lng_ in rows]
+    return ids, coords
+
+
+# DB 후보를 정확한 거리로 거름 (워커 메모리 인덱스 없이 항상 최신 상태를 읽어야 할 때)
+def nearby_store_distances_db(lat, lng, radius_km):
+    return filter_radius(lat, lng, radius_km, *nearby_store_candidates_db(lat, lng, radius_km))
+
+
+def nearby_store_ids_db(lat, lng, radius_km):
+    return nearby_store_distances_db(lat, lng, radius_km)[0].tolist()
+
+
+# 반경을 덮는 가게 후보 -> (가게 id 목록, 좌표 목록), filter_radius 로 정확히 거름
+def nearby_store_candidates(lat, lng, radius_km):
+    if settings.STORE_NEARBY_SEARCH == "db":
+        return nearby_store_candidates_db(lat, lng, radius_km)
+    return get_store_index().candidates(lat, lng, radius_km)
+
+
+# 반경 내 가게 -> (가게 id 배열, 거리(km) 배열), 거리는 한 번의 배열 연산으로 계산
+def nearby_store_distances(lat, lng, radius_km):
+    if settings.STORE_NEARBY_SEARCH == "db":
+        return nearby_store_distances_db(lat, lng, radius_km)
+    return get_store_index().within_distances(lat, lng, radius_km)
+
+
+def nearby_store_ids(lat, lng, radius_km):
+    return nearby_store_distances(lat, lng, radius_km)[0].tolist()
+
+
+# 가게별 거리를 쿼리셋에 distance_km 로 붙임 (DB 에서 거리순 정렬 / 페이지 나누기 가능)
+def annotate_distance(queryset, store_ids, distances, field="store_id"):
+    if not len(store_ids):
+        return queryset.annotate(distance_km=Value(None, output_field=FloatField()))
+    whens = [
+        When(**{field: int(store_id)}, then=Value(round(float(d), 3)))
+        for store_id, d in zip(store_ids, distances)
+    ]
+    return queryset.annotate(distance_km=Case(*whens, default=Value(None), output_field=FloatField()))
+
+
+# signal 에서 호출 (인덱스가 아직 없으면 다음 조회 때 만들어짐)
+def update_store(store):
+    if _GRID.current is not None:
+        _GRID.current.upsert(store.id, store.latitude, store.longitude, store.is_open)
+
+
+def remove_store(store_id):
+    if _GRID.current is not None:
+        _GRID.current.remove(store_id)
@@ -15,10 +15,15 @@ from .models import Store
 from .serializers import *
 
 from accounts.permissions import IsSeller,IsConsumer
+from project.pagination import KeysetPagination
+from project.db_router import ReplicaReadMixin
 
-class StoreViewSet(mixins.ListModelMixin, mixins.RetrieveModelMixin, viewsets.GenericViewSet):
+class StoreViewSet(ReplicaReadMixin, mixins.ListModelMixin, mixins.RetrieveModelMixin, viewsets.GenericViewSet):
+    replica_actions = ("list", "retrieve")
+    query_budgets = {"list": 4, "retrieve": 4}
     queryset = Store.objects.all()
     parser_classes = [JSONParser, FormParser, MultiPartParser]
+    pagination_class = KeysetPagination
 
     def get_serializer_class(self):
         if self.action == "signup_step1":
@@ -36,7 +41,8 @@ class StoreViewSet(mixins.ListModelMixin, mixins.RetrieveModelMixin, viewsets.Ge
 
     # 모든 상점 조회
     def list(self, request, *args, **kwargs):
-        qs = self.queryset
+        # StoreSerializer.seller 가 가게마다 판매자를 조회하지 않도록
+        qs = self.queryset.select_related("seller")
         
         # 1) is_open 필터
         is_open = request.query_params.get("is_open")
@@ -45,8 +51,9 @@ class StoreViewSet(mixins.ListModelMixin, mixins.RetrieveModelMixin, viewsets.Ge
         elif is_open == "false":
             qs = qs.filter(is_open=False)
 
-        serializer = self.get_serializer(qs, many =True)
-        return Response(serializer.data)
+        page = self.paginate_queryset(qs)
+        serializer = self.get_serializer(page, many =True)
+        return self.get_paginated_response(serializer.data)
 
     # 가게 오픈/마감 처리
     @action(detail=False, methods=["patch"], url_path="is_open")
@@ -58,7 +65,8 @@ class StoreViewSet(mixins.ListModelMixin, mixins.RetrieveModelMixin, viewsets.Ge
         
         # 현재 값 반전
         store.is_open = not store.is_open
-        store.save(update_fields=["is_open"])
+        # updated_at 도 같이 저장해야 다른 워커의 가게 공간 인덱스가 변경을 감지함
+        store.save(update_fields=["is_open", "updated_at"])
 
         return Response({
             "store_id": store.id,